@@ -0,0 +1,114 @@
+"""
+Benchmark - Dışa aktarım hızı ve bellek
+=======================================
+save_to_excel (bellekte liste + normal Workbook) ile tracker/exporters.py
+akışlı yazıcılarını karşılaştırır. Her yöntem ayrı bir süreçte çalışır,
+böylece tepe RSS (ru_maxrss) değerleri birbirini etkilemez. Eski yöntem
+price_tracker'dan değil, aşağıdaki kopyasından çalışır; price_tracker'ı
+içe aktarmak (Playwright, NumPy, tüm tracker modülleri) ölçüme yazıcı
+yerine içe aktarım ayak izini katardı.
+
+Kullanim:
+    python benchmarks/export_speed.py [satir_sayisi]
+"""
+
+import asyncio
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Kök dizini modül yoluna ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_rows(count: int):
+    """Sentetik sonuç satırları üretir (liste değil, generator)."""
+    for i in range(count):
+        yield {
+            "name": f"Ürün {i}",
+            "title": f"Örnek ürün başlığı {i} - 256 GB Siyah",
+            "price": f"{1000 + i % 5000},99 TL",
+            "price_numeric": 1000.99 + i % 5000,
+            "availability": "Stokta Var",
+            "url": f"https://books.toscrape.com/catalogue/item_{i}/index.html",
+            "timestamp": "2026-01-01 12:00:00",
+            "status": "[OK] Başarılı",
+        }
+
+
+def legacy_save_to_excel(products_data: list, filename: str):
+    """price_tracker.save_to_excel'in kopyası (çıktı mesajları hariç)."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Fiyatlar"
+
+    headers = ["Ürün Adı", "Site Başlığı", "Fiyat (Metin)", "Fiyat (Sayı)", "Stok/Durum", "Link", "Zaman", "Durum"]
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="2C3E50", end_color="2C3E50", fill_type="solid")
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center")
+
+    for row, p in enumerate(products_data, 2):
+        ws.cell(row=row, column=1, value=p["name"])
+        ws.cell(row=row, column=2, value=p["title"])
+        ws.cell(row=row, column=3, value=p["price"])
+        ws.cell(row=row, column=4, value=p["price_numeric"])
+        ws.cell(row=row, column=5, value=p["availability"])
+        ws.cell(row=row, column=6, value=p["url"])
+        ws.cell(row=row, column=7, value=p["timestamp"])
+        ws.cell(row=row, column=8, value=p["status"])
+
+    dims = [20, 50, 15, 12, 25, 60, 20, 30]
+    for i, w in enumerate(dims, 1):
+        ws.column_dimensions[chr(64 + i)].width = w
+
+    wb.save(filename)
+
+
+def run_method(method: str, count: int, out_dir: str, queue):
+    started = time.perf_counter()
+    if method == "save_to_excel":
+        legacy_save_to_excel(list(make_rows(count)), str(Path(out_dir) / "eski.xlsx"))
+    else:
+        from tracker.exporters import aiter_rows, export_rows
+
+        asyncio.run(export_rows(aiter_rows(make_rows(count)), str(Path(out_dir) / f"akis.{method}")))
+    elapsed = time.perf_counter() - started
+
+    # Linux'ta KB, macOS'ta bayt
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1024 if sys.platform != "darwin" else peak / 1024 / 1024
+    queue.put((method, count / elapsed, peak_mb))
+
+
+def main(count: int):
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for method in ("save_to_excel", "xlsx", "csv", "parquet"):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=run_method, args=(method, count, out_dir, queue))
+            proc.start()
+            proc.join()
+            if proc.exitcode == 0:
+                results.append(queue.get())
+            else:
+                print(f"[WARN] {method} çalışmadı (çıkış kodu {proc.exitcode})")
+
+    print(f"\n{count} satır")
+    print(f"{'Yöntem':<15} {'Satır/sn':>12} {'Tepe RSS (MB)':>15}")
+    for method, rate, peak in results:
+        print(f"{method:<15} {rate:>12,.0f} {peak:>15.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,100 @@
+"""
+Benchmark - Ürün başına CDP round-trip sayısı
+=============================================
+Aynı sayfada iki yolu karşılaştırır:
+  - get_text: her selector için wait_for_selector + inner_text
+    (eski scrape() akışı, `or` zincirleri dahil)
+  - extract:  tüm FIELDS tek bir page.evaluate çağrısında
+
+Kullanim:
+    python benchmarks/extraction_roundtrips.py [url ...]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Kök dizini modül yoluna ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import async_playwright
+from price_tracker import PRODUCTS_TO_TRACK, USER_AGENT, get_scraper
+
+
+class CountingHandle:
+    """ElementHandle çağrılarını sayar."""
+
+    def __init__(self, handle, counter):
+        self._handle = handle
+        self._counter = counter
+
+    async def inner_text(self):
+        self._counter["calls"] += 1
+        return await self._handle.inner_text()
+
+
+class CountingPage:
+    """Page üzerindeki CDP'ye giden çağrıları sayar."""
+
+    def __init__(self, page):
+        self._page = page
+        self.counter = {"calls": 0}
+
+    async def wait_for_selector(self, selector, **kwargs):
+        self.counter["calls"] += 1
+        handle = await self._page.wait_for_selector(selector, **kwargs)
+        return CountingHandle(handle, self.counter) if handle else None
+
+    async def query_selector(self, selector):
+        self.counter["calls"] += 1
+        handle = await self._page.query_selector(selector)
+        return CountingHandle(handle, self.counter) if handle else None
+
+    async def evaluate(self, expression, arg=None):
+        self.counter["calls"] += 1
+        return await self._page.evaluate(expression, arg)
+
+
+async def via_get_text(scraper, page) -> dict:
+    """Eski akış: her alan için yedek selector'ları sırayla get_text ile dener."""
+    data = {}
+    for field in scraper._fields:
+        value = False if field["exists"] else None
+        for selector in field["selectors"]:
+            if field["exists"]:
+                if await page.query_selector(selector):
+                    value = True
+                    break
+            else:
+                value = await scraper.get_text(page, selector)
+                if value:
+                    break
+        data[field["name"]] = value
+    return data
+
+
+async def main(urls: list):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(user_agent=USER_AGENT)
+        page = await context.new_page()
+
+        print(f"{'Yol':<10} {'Round-trip':>10} {'Süre (s)':>10}  URL")
+        for url in urls:
+            await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+            scraper = get_scraper(url)
+
+            for label, run in (("get_text", via_get_text), ("extract", lambda s, pg: s.extract(pg))):
+                counting = CountingPage(page)
+                started = time.perf_counter()
+                await run(scraper, counting)
+                elapsed = time.perf_counter() - started
+                print(f"{label:<10} {counting.counter['calls']:>10} {elapsed:>10.2f}  {url}")
+
+        await browser.close()
+
+
+if __name__ == "__main__":
+    targets = sys.argv[1:] or [p["url"] for p in PRODUCTS_TO_TRACK]
+    asyncio.run(main(targets))
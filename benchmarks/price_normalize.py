@@ -0,0 +1,98 @@
+"""
+Benchmark - Fiyat normalleştirme
+================================
+Eski tek-metin clean_price mantığı (regex + virgül/nokta kuralları) ile
+tracker/prices.py'deki toplu NumPy normalleştiricisini aynı sentetik
+fiyat metinleri üzerinde karşılaştırır. Her yöntem REPEATS kez çalışır ve
+en iyi süresi raporlanır (paylaşımlı makinelerde tek ölçüm çok oynak).
+Eski yöntemin 0.0 döndürdüğü (ortalamaları bozan) satır sayısı da raporlanır.
+
+Kullanim:
+    python benchmarks/price_normalize.py [metin_sayisi]
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Kök dizini modül yoluna ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracker.prices import normalize_prices
+
+
+REPEATS = 3
+
+TEMPLATES = (
+    "{int},{frac} TL",
+    "₺{thousands}",
+    "${us}",
+    "{int},{frac} €",
+    "£{plain}",
+    "{int},{frac}TL",
+    "12 x {plain} TL",
+    "Tükendi",
+)
+
+
+def make_texts(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        value = rng.randint(1, 250_000)
+        cents = rng.randint(0, 99)
+        texts.append(rng.choice(TEMPLATES).format(
+            int=f"{value:,}".replace(",", "."),
+            frac=f"{cents:02d}",
+            thousands=f"{value:,}".replace(",", "."),
+            us=f"{value:,}.{cents:02d}",
+            plain=f"{value}.{cents:02d}",
+        ))
+    return texts
+
+
+def legacy_clean_price(price_text: str) -> float:
+    """BaseScraper.clean_price'ın önceki hali."""
+    if not price_text:
+        return 0.0
+    clean = re.sub(r'[^\d,.]', '', price_text)
+    if ',' in clean and '.' in clean:
+        clean = clean.replace('.', '').replace(',', '.')
+    elif ',' in clean:
+        clean = clean.replace(',', '.')
+    try:
+        return float(clean)
+    except ValueError:
+        return 0.0
+
+
+def best_of(func, repeats: int = REPEATS):
+    """func'ı repeats kez çalıştırır; (son sonuç, en kısa süre)."""
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main(count: int):
+    texts = make_texts(count)
+
+    legacy, legacy_elapsed = best_of(lambda: [legacy_clean_price(text) for text in texts])
+    (values, valid, currencies), batch_elapsed = best_of(lambda: normalize_prices(texts))
+
+    print(f"\n{count:,} metin")
+    print(f"{'Yöntem':<20} {'Metin/sn':>14} {'Süre (sn)':>10}")
+    print(f"{'clean_price (eski)':<20} {count / legacy_elapsed:>14,.0f} {legacy_elapsed:>10.2f}")
+    print(f"{'normalize_prices':<20} {count / batch_elapsed:>14,.0f} {batch_elapsed:>10.2f}")
+    print(f"\nEski yöntemde 0.0: {sum(1 for v in legacy if v == 0.0):,}")
+    print(f"Geçersiz (maske): {int((~valid).sum()):,}")
+    print(f"Para birimi bulunan: {int((currencies != '').sum()):,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -9,17 +9,47 @@ Desteklenen Siteler:
 - Trendyol (trendyol.com)
 - Hepsiburada (hepsiburada.com)
 - Books to Scrape (books.toscrape.com - Demo)
+
+Site tanımları (selector'lar) tracker/sites/*.json dosyalarındadır.
 """
 
+import argparse
 import asyncio
-import re
-from abc import ABC, abstractmethod
-from datetime import datetime
+import os
+import socket
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from pathlib import Path
 from urllib.parse import urlparse
 from playwright.async_api import async_playwright, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 
+from tracker.alerts import AlertEngine, load_sink_plugins, make_sink
+from tracker.anomaly import AnomalyDetector
+from tracker.blocking import ResourceBlocker
+from tracker.browser_state import StorageStateStore, connect_browser
+from tracker.conditional import PageValidators
+from tracker.exporters import aiter_rows, export_format, export_rows
+from tracker.fetcher import HttpClient, TieredFetcher
+from tracker.history import PriceHistory
+from tracker.listing import extract_cards
+from tracker.pool import PagePool, run_in_order
+from tracker.ratelimit import THROTTLE_STATUSES, BlockedError, DomainLimiter, is_block_url
+from tracker.registry import default_registry
+from tracker.retry import CircuitBreaker, RetryPolicy
+from tracker.scheduler import Scheduler
+from tracker.scrapers import READY_TIMEOUT, SELECTOR_TIMEOUT, BaseScraper
+from tracker.snapshots import SnapshotStore, reextract
+from tracker.stats import TIMING_KEYS, RunStats
+from tracker.structured import StructuredExtractor
+from tracker.waits import ReadinessModel
+from tracker.watchlist import iter_watchlist, parse_shard, shard
+from tracker.workers import ProcessPoolRunner
+from tracker.workqueue import WorkQueue, open_queue
+
 # ============================================================
 # AYARLAR - Takip edilecek ürünler
 # ============================================================
@@ -38,170 +68,373 @@ PRODUCTS_TO_TRACK = [
     },
 ]
 
-# ============================================================
-# SCRAPER CLASSES
-# ============================================================
+# Eşzamanlılık: aynı anda açık sayfa sayısı ve dağıtılacağı context sayısı
+# (CONCURRENCY = 1 eski sıralı davranışla aynıdır)
+CONCURRENCY = 4
+BROWSER_CONTEXTS = 2
 
-class BaseScraper(ABC):
-    """Tüm scraper'lar için temel sınıf."""
-    
-    @abstractmethod
-    async def scrape(self, page: Page) -> dict:
-        """Sayfadan veriyi çeker ve sözlük döndürür."""
-        pass
+# Domain bazında öğrenilen hazır olma süreleri (p50/p95) burada saklanır
+WAIT_STATS_FILE = "bekleme_sureleri.json"
 
-    async def get_text(self, page: Page, selector: str) -> str:
-        """Element metnini güvenli bir şekilde alır."""
-        try:
-            element = await page.wait_for_selector(selector, timeout=3000)
-            if element:
-                return await element.inner_text()
-        except:
-            pass
-        return None
+# Önce tarayıcısız HTTP + HTML ayrıştırıcı dene, olmazsa Playwright'a düş
+HTTP_FIRST = True
 
-    def clean_price(self, price_text: str) -> float:
-        """Fiyat metnini sayıya çevirir."""
-        if not price_text:
-            return 0.0
-        # Sadece sayıları ve virgül/noktayı bırak
-        clean = re.sub(r'[^\d,.]', '', price_text)
-        # Türkçe formatı (1.299,90) -> (1299.90) standardına çevir
-        if ',' in clean and '.' in clean:
-            clean = clean.replace('.', '').replace(',', '.')
-        elif ',' in clean:
-            clean = clean.replace(',', '.')
-        
-        try:
-            return float(clean)
-        except ValueError:
-            return 0.0
+# Görsel/font/video ve izleyici isteklerini engelle (tracker/blocking.py)
+BLOCK_RESOURCES = True
 
-class AmazonScraper(BaseScraper):
-    async def scrape(self, page: Page) -> dict:
-        title = await self.get_text(page, "#productTitle")
-        
-        # Amazon fiyatları bazen whole/fraction olarak ayrılır
-        price_whole = await self.get_text(page, ".a-price-whole")
-        price_fraction = await self.get_text(page, ".a-price-fraction")
-        
-        if price_whole:
-            price_text = f"{price_whole}"
-            if price_fraction:
-                price_text +=f",{price_fraction}"
-        else:
-            # Alternatif fiyat alanı
-            price_text = await self.get_text(page, "#priceblock_ourprice") or \
-                         await self.get_text(page, "#apex_desktop .a-offscreen")
-            
-        availability = await self.get_text(page, "#availability")
-        
-        return {
-            "title": title.strip() if title else "Başlık Bulunamadı",
-            "price": price_text.strip() if price_text else "N/A",
-            "stock": availability.strip().replace("\n", "") if availability else "Belirsiz"
-        }
-
-class TrendyolScraper(BaseScraper):
-    async def scrape(self, page: Page) -> dict:
-        title = await self.get_text(page, "h1.product-name") or await self.get_text(page, ".product-name-text")
-        price = await self.get_text(page, ".product-price-container") or await self.get_text(page, ".prc-dsc")
-        
-        # Trendyol stok kontrolü biraz dolaylıdır, sepete ekle butonu var mı?
-        add_to_cart = await page.query_selector(".add-to-basket-button-text")
-        stock = "Stokta Var" if add_to_cart else "Stok Yok/Tükendi"
-
-        return {
-            "title": title.strip() if title else "Başlık Bulunamadı",
-            "price": price.strip() if price else "N/A",
-            "stock": stock
-        }
-
-class HepsiburadaScraper(BaseScraper):
-    async def scrape(self, page: Page) -> dict:
-        title = await self.get_text(page, "h1#product-name")
-        price = await self.get_text(page, '[data-test-id="price-current-price"]')
-        
-        # Hepsiburada stok/kargo bilgisi
-        stock_info = await self.get_text(page, ".shipping-date") or \
-                     await self.get_text(page, ".delivery-info") or \
-                     await self.get_text(page, ".product-inventory-status")
-
-        return {
-            "title": title.strip() if title else "Başlık Bulunamadı",
-            "price": price.strip() if price else "N/A",
-            "stock": stock_info.strip() if stock_info else "Stok Bilgisi Yok"
-        }
-
-class LegacyScraper(BaseScraper):
-    """books.toscrape.com için"""
-    async def scrape(self, page: Page) -> dict:
-        title = await self.get_text(page, "h1")
-        price = await self.get_text(page, "p.price_color")
-        stock = await self.get_text(page, "p.availability")
-        
-        return {
-            "title": title.strip() if title else "Not Found",
-            "price": price.strip() if price else "N/A",
-            "stock": stock.strip() if stock else "N/A"
-        }
+# Tüm gözlemlerin tutulduğu kalıcı depo; Excel bunun bir görünümüdür
+HISTORY_DB = "fiyat_gecmisi.db"
+# Çıktı dosyası; uzantı formatı belirler (xlsx, csv, parquet)
+EXPORT_FILE = "fiyat_takibi.xlsx"
+
+# Aynı siteye aynı anda en fazla bu kadar istek (AIMD ile 1'den başlar,
+# bkz. tracker/ratelimit.py)
+DOMAIN_CONCURRENCY = 2
+
+# Hata yönetimi: sayfa açma zaman aşımı (ms), deneme sayısı ve üstel
+# bekleme (sn); domain art arda BREAKER_THRESHOLD kez başarısız olursa
+# BREAKER_COOLDOWN sn boyunca kalan URL'leri atlanır
+NAVIGATION_TIMEOUT = 45000
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 30.0
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 300
+
+# Çok süreçli mod (--workers N): işçi başına bellek sınırı (MB, Chromium dahil)
+WORKER_MEMORY_MB = 1500
+
+# Dağıtık kuyruk (--queue): kira süresi, kira yenileme ve yoklama aralığı (sn)
+QUEUE_LEASE_SECONDS = 300
+QUEUE_HEARTBEAT = 60
+QUEUE_POLL = 1.0
+
+# Daemon modu (--daemon): zamanlayıcı kontrol aralığı ve periyodik özet (sn)
+DAEMON_TICK = 5
+DAEMON_SUMMARY_EVERY = 3600
+
+# Sıcak başlangıç: çalışan bir tarayıcı sunucusu (ör. `playwright run-server
+# --port 3000` -> ws://localhost:3000/) ve domain başına kaydedilen çerezler
+BROWSER_ENDPOINT = None
+
+# Sızıntıya karşı: sayfa N gezinmeden, context M gezinmeden sonra ya da Chromium
+# süreçlerinin toplam RSS'i sınırı aşınca yenilenir (psutil gerekir)
+PAGE_RECYCLE_AFTER = 50
+CONTEXT_RECYCLE_AFTER = 500
+BROWSER_MEMORY_MB = 2500
+
+# Ürün başına son N fiyatın medyan/MAD'ine göre aykırı fiyat işaretleme
+# (taksit tutarı, üstü çizili fiyat gibi yanlış selector sonuçları)
+ANOMALY_DETECTION = True
+ANOMALY_WINDOW = 20
+ANOMALY_THRESHOLD = 5.0
+ANOMALY_MIN_RATIO = 2.0
+
+# Fiyat alarmları: kural dosyası varsa her sonuç kurallarla değerlendirilir
+# (bkz. tracker/alerts.py). Sink'ler: "console", "jsonl:yol", "webhook:url"
+ALERT_RULES_FILE = "alarm_kurallari.json"
+ALERT_SINKS = ["console", "jsonl:alarmlar.jsonl"]
+
+# Kategori taramasında (--listing) kategori başına en fazla sayfa
+LISTING_MAX_PAGES = 50
+
+# JSON-LD / gömülü durum script'lerini selector'lardan önce dene
+STRUCTURED_DATA = True
+
+# HTTP kademesinde ETag/Last-Modified ile koşullu istek; değişmeyen
+# sayfalar çözülmeden "değişmedi" gözlemi olarak kaydedilir
+CONDITIONAL_FETCH = True
+VALIDATORS_DB = "sayfa_dogrulayicilar.db"
+
+# Görülen HTML'i sıkıştırılmış olarak arşivle (--snapshots); selector'lar
+# düzeltildiğinde --reextract ile geçmiş ağa çıkmadan onarılır
+SNAPSHOTS = False
+SNAPSHOT_DIR = "sayfa_arsivi"
+PERSIST_STORAGE = True
+STORAGE_STATE_DIR = "oturumlar"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# ============================================================
+# SCRAPER SEÇİMİ
+# ============================================================
+# Site tanımları tracker/sites/*.json dosyalarındadır (bkz. tracker/registry.py).
+# Yeni bir perakendeci için oraya bir dosya eklemek yeterlidir.
 
 def get_scraper(url: str) -> BaseScraper:
-    domain = urlparse(url).netloc
-    if "amazon" in domain:
-        return AmazonScraper()
-    elif "trendyol" in domain:
-        return TrendyolScraper()
-    elif "hepsiburada" in domain:
-        return HepsiburadaScraper()
-    else:
-        return LegacyScraper()
+    return default_registry().create(url)
 
 # ============================================================
 # MAIN LOGIC
 # ============================================================
 
-async def process_product(page: Page, product_info: dict) -> dict:
+class TrackerSession:
+    """Bir çalıştırma boyunca paylaşılan bileşenler (istatistik, fetcher, depo...)."""
+
+    def __init__(self, stats: RunStats = None, fetcher: TieredFetcher = None,
+                 blocker: ResourceBlocker = None, history: PriceHistory = None,
+                 limiter: DomainLimiter = None, retry: RetryPolicy = None,
+                 breaker: CircuitBreaker = None, waits: ReadinessModel = None,
+                 storage: StorageStateStore = None, snapshots: SnapshotStore = None,
+                 structured: StructuredExtractor = None, anomaly: AnomalyDetector = None,
+                 alerts: AlertEngine = None):
+        self.stats = stats or RunStats()
+        self.fetcher = fetcher
+        self.blocker = blocker
+        self.history = history
+        self.limiter = limiter
+        self.retry = retry
+        self.breaker = breaker
+        self.waits = waits
+        self.storage = storage
+        self.snapshots = snapshots
+        self.structured = structured
+        self.anomaly = anomaly
+        self.alerts = alerts
+        for component in (fetcher, blocker, limiter, breaker, waits, storage, snapshots, structured,
+                          anomaly, alerts):
+            if component:
+                self.stats.add_reporter(component.summary_lines)
+
+    @classmethod
+    def from_settings(cls, history: bool = True, snapshots: bool = SNAPSHOTS) -> "TrackerSession":
+        """
+        AYARLAR bölümündeki değerlere göre bileşenleri kurar.
+        history=False: depoya ana süreç yazar (işçi süreçleri için).
+        """
+        # Aynı sayaç hem HTTP kademesinde hem tarayıcıda kullanılır
+        structured = StructuredExtractor() if STRUCTURED_DATA else None
+        store = PriceHistory(HISTORY_DB) if history else None
+        anomaly = None
+        if ANOMALY_DETECTION and store:
+            # Sonuçları kaydeden süreç denetler; pencereler geçmişten ısıtılır
+            anomaly = AnomalyDetector(ANOMALY_WINDOW, ANOMALY_THRESHOLD, ANOMALY_MIN_RATIO)
+            anomaly.warm_up(store.recent_prices(ANOMALY_WINDOW))
+        alerts = None
+        if store and Path(ALERT_RULES_FILE).exists():
+            alerts = AlertEngine.from_file(ALERT_RULES_FILE, [make_sink(spec) for spec in ALERT_SINKS]
+                                           + load_sink_plugins())
+            # Pencereden eski URL'lerin son fiyatı/stoğu tek gözlemle tohumlanır
+            # (eşik ve stok alarmları her çalıştırmada yeniden tetiklenmesin);
+            # sonra en uzun "drop" penceresi kadar geçmiş sırayla okunur
+            since = (datetime.now() - timedelta(days=alerts.warmup_days)).strftime("%Y-%m-%d %H:%M:%S")
+            alerts.warm_up(store.iter_latest_valid(before=since))
+            alerts.warm_up(store.iter_since(since))
+        return cls(
+            fetcher=TieredFetcher(
+                HttpClient(USER_AGENT, pool_size=CONCURRENCY * 2),
+                validators=PageValidators(VALIDATORS_DB) if CONDITIONAL_FETCH else None,
+                structured=structured,
+            ) if HTTP_FIRST else None,
+            blocker=ResourceBlocker() if BLOCK_RESOURCES else None,
+            history=store,
+            limiter=DomainLimiter(DOMAIN_CONCURRENCY),
+            retry=RetryPolicy(RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY),
+            breaker=CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN),
+            waits=ReadinessModel(WAIT_STATS_FILE),
+            storage=StorageStateStore(STORAGE_STATE_DIR) if PERSIST_STORAGE else None,
+            snapshots=SnapshotStore(SNAPSHOT_DIR) if snapshots else None,
+            structured=structured,
+            anomaly=anomaly,
+            alerts=alerts,
+        )
+
+    def new_pool(self, browser, concurrency: int = CONCURRENCY,
+                 contexts: int = BROWSER_CONTEXTS) -> PagePool:
+        def context_options() -> dict:
+            options = {"user_agent": USER_AGENT}
+            if self.storage:
+                # Önceki çalıştırmaların (ya da yenilenen context'lerin)
+                # çerez/onay durumu ile sıcak başla
+                options.update(self.storage.context_options())
+            return options
+
+        pool = PagePool(browser, size=concurrency, contexts=contexts,
+                        context_options=context_options,
+                        setup_context=self.blocker.attach if self.blocker else None,
+                        teardown_context=self.storage.capture if self.storage else None,
+                        recycle_after=PAGE_RECYCLE_AFTER,
+                        context_recycle_after=CONTEXT_RECYCLE_AFTER,
+                        memory_limit_mb=BROWSER_MEMORY_MB, stats=self.stats)
+        self.stats.add_reporter(pool.summary_lines)
+        return pool
+
+    def throttle(self, domain: str):
+        """Domain için hız sınırı yeri; limiter yoksa beklemez."""
+        return self.limiter.slot(domain) if self.limiter else nullcontext()
+
+    def record(self, result: dict):
+        """Tamamlanan bir sonucu hemen kalıcı depoya yazar."""
+        self.stats.mark_first_result()
+        if self.anomaly:
+            result["anomaly"] = self.anomaly.check(result["url"], result["price_numeric"])
+            if result["anomaly"]:
+                print(f"[ANOMALY] {result['name']}: {result['price']} ({result['anomaly']})")
+        if self.history:
+            self.history.add(result)
+        if self.alerts:
+            self.alerts.observe(result)
+
+    def close(self):
+        if self.waits:
+            self.waits.save()
+        if self.fetcher:
+            self.fetcher.close()
+        if self.history:
+            self.history.close()
+        if self.snapshots:
+            self.snapshots.close()
+        if self.alerts:
+            self.alerts.close()
+
+async def scrape_product(page: Page, url: str, scraper: BaseScraper,
+                         session: TrackerSession, snapshot=None) -> dict:
+    """
+    Tek deneme: önce HTTP kademesi, gerekirse tarayıcı. Hata durumunda fırlatır.
+    snapshot verilirse çözülen sayfanın HTML'i ile çağrılır (arşiv için).
+    """
+    domain = urlparse(url).netloc
+    stats, fetcher, blocker = session.stats, session.fetcher, session.blocker
+    data = await fetcher.fetch_http(url, domain, scraper, on_html=snapshot) if fetcher else None
+
+    if data is None:
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+        if (response and response.status in THROTTLE_STATUSES) or is_block_url(page.url):
+            raise BlockedError(f"HTTP {response.status if response else '?'} ({domain})")
+
+        # Sunucuda gömülen yapısal veri domcontentloaded'da hazırdır; bulunursa
+        # render beklemesi ve selector yürütme tamamen atlanır
+        if session.structured:
+            data = await session.structured.from_page(page, domain, scraper.spec)
+
+        if data is None:
+            # Sabit bekleme yerine fiyat işareti / ağ sessizliği, öğrenilmiş sınırla.
+            # Sınır toplam beklemeyi kapsar: ağ sessizliği işaretten önce geldiyse
+            # işaret sınırın kalanı kadar beklenir.
+            if session.waits:
+                deadline = time.monotonic() + session.waits.cap_ms(domain) / 1000
+                await session.waits.wait(page, scraper.price_selectors or scraper.ready_selectors, domain)
+                remaining = max(0, int((deadline - time.monotonic()) * 1000))
+                data = await scraper.scrape(page, timeout=remaining)
+            else:
+                await page.wait_for_timeout(2000)
+                data = await scraper.scrape(page)
+        if snapshot:
+            await snapshot(await page.content())
+        stats.incr("fast_fail", scraper.fast_fails)
+        stats.incr("fast_fail_saved_ms", scraper.fast_fails * SELECTOR_TIMEOUT)
+        if fetcher:
+            fetcher.record_browser(domain)
+        if blocker:
+            blocked = blocker.take_page_counts(page)
+            print(f"[BLOCK] {blocked['requests']} istek engellendi (~{blocked['bytes'] // 1000} KB)")
+    return data
+
+def failed_result(product_info: dict, title: str, status: str) -> dict:
+    return {
+        "name": product_info["name"],
+        "title": title,
+        "price": "N/A",
+        "price_numeric": None,
+        "currency": None,
+        "availability": "N/A",
+        "url": product_info["url"],
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "status": status,
+        "group": product_info.get("group"),
+    }
+
+def snapshot_saver(session: TrackerSession, product_info: dict, timestamp: str):
+    """Arşiv açıksa sayfa HTML'ini (thread'de) kaydeden çağrılabilir döndürür."""
+    if not session.snapshots:
+        return None
+
+    async def save(html: str):
+        await asyncio.to_thread(session.snapshots.save, product_info["url"], html,
+                                timestamp, product_info["name"])
+    return save
+
+async def process_product(pages, product_info: dict, session: TrackerSession = None) -> dict:
+    """
+    Ürünü deneme/bekleme politikasıyla işler. pages: sayfa veren async
+    context manager fabrikası (ör. PagePool.page). Domain yeri, jeton ve
+    sayfa her denemede yeniden alınır; beklemeler hiçbirini tutmaz.
+    """
     url = product_info["url"]
+    domain = urlparse(url).netloc
+    session = session or TrackerSession()
+    stats, limiter, breaker = session.stats, session.limiter, session.breaker
+    retry = session.retry or RetryPolicy(attempts=1)
+    stats.incr("products")
+
+    # Devre açıksa bu domaine hiç gitme
+    if breaker and not breaker.allow(domain):
+        print(f"[SKIP] {product_info['name']} -> {domain} devresi açık")
+        stats.incr("skipped")
+        return failed_result(product_info, "ATLANDI", f"[SKIP] Devre açık ({domain})")
+
     print(f"[SCRAPING] {product_info['name']} -> {url}")
-    
-    try:
-        await page.goto(url, wait_until="domcontentloaded", timeout=45000)
-        
-        # Bot algılamayı önlemek için rastgele bekleme
-        await page.wait_for_timeout(2000)
-        
-        scraper = get_scraper(url)
-        data = await scraper.scrape(page)
-        
-        # Fiyat sayısal çevrimi
-        price_numeric = scraper.clean_price(data["price"])
-        
-        return {
-            "name": product_info["name"],
-            "title": data["title"],
-            "price": data["price"],
-            "price_numeric": price_numeric,
-            "availability": data["stock"],
-            "url": url,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "status": "[OK] Başarılı"
-        }
-        
-    except Exception as e:
-        print(f"[ERROR] {product_info['name']} Hatası: {str(e)}")
-        return {
-            "name": product_info["name"],
-            "title": "HATA",
-            "price": "N/A",
-            "price_numeric": 0,
-            "availability": "N/A",
-            "url": url,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "status": f"[ERROR] {str(e)[:50]}"
-        }
+    for attempt in range(1, retry.attempts + 1):
+        # Gözlem zamanı denemenin başıdır; arşivdeki sayfa da aynı zamanla
+        # indekslenir ki --reextract doğru gözlemi onarabilsin
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            scraper = get_scraper(url)
+            async with session.throttle(domain):
+                async with pages() as page:
+                    # Gecikme yer/sayfa beklemesini içermez: kendi kuyruğumuz
+                    # sitenin yavaşlığı sayılıp AIMD artışını bastırmasın
+                    started = time.monotonic()
+                    data = await scrape_product(page, url, scraper, session,
+                                                snapshot=snapshot_saver(session, product_info, timestamp))
+                    latency = time.monotonic() - started
+            
+            # Fiyat sayısal çevrimi
+            price_numeric = scraper.clean_price(data["price"])
+            if price_numeric is None:
+                stats.incr("price_invalid")
+            stats.incr("ok")
+            if data.get("unchanged"):
+                stats.incr("unchanged")
+            if limiter:
+                limiter.report(domain, ok=True, latency=latency)
+            if breaker:
+                breaker.record_success(domain)
+            
+            return {
+                "name": product_info["name"],
+                "title": data["title"],
+                "price": data["price"],
+                "price_numeric": price_numeric,
+                "currency": scraper.price_currency(data["price"]),
+                "availability": data["stock"],
+                "url": url,
+                "timestamp": timestamp,
+                "status": "[OK] Değişmedi" if data.get("unchanged") else "[OK] Başarılı",
+                "group": product_info.get("group"),
+            }
+            
+        except Exception as e:
+            error = e
+            print(f"[ERROR] {product_info['name']} Hatası ({attempt}/{retry.attempts}): {str(e)}")
+            if limiter:
+                throttled = isinstance(e, (BlockedError, PlaywrightTimeoutError))
+                limiter.report(domain, ok=False, throttled=throttled)
+            # Başka bir iş devreyi açtıysa beklemeye gerek yok
+            if attempt == retry.attempts or (breaker and breaker.is_open(domain)):
+                break
+            delay = retry.delay(attempt)
+            print(f"[RETRY] {delay:.1f} sn sonra tekrar denenecek")
+            stats.incr("retries")
+            await asyncio.sleep(delay)
+
+    stats.incr("error")
+    if breaker:
+        breaker.record_failure(domain)
+    return failed_result(product_info, "HATA", f"[ERROR] {str(error)[:50]}")
 
 def save_to_excel(products_data: list, filename: str = "fiyat_takibi.xlsx"):
+    """Tüm listeyi bellekte Workbook'a yazar; büyük çıktılar için tracker/exporters.py."""
     print(f"\n[EXCEL] Kaydediliyor: {filename}")
     wb = Workbook()
     ws = wb.active
@@ -237,24 +470,478 @@ def save_to_excel(products_data: list, filename: str = "fiyat_takibi.xlsx"):
     wb.save(filename)
     print(f"[OK] Kayıt tamamlandı.")
 
-async def main():
+async def run_product(pool: PagePool, product: dict, session: TrackerSession,
+                      record: bool = True) -> dict:
+    """Ürünü havuzdaki sayfalarla işler ve kaydeder."""
+    result = await process_product(pool.page, product, session)
+    if record:
+        session.record(result)
+    return result
+
+async def track_products(browser, products, session: TrackerSession,
+                         concurrency: int = CONCURRENCY, contexts: int = BROWSER_CONTEXTS,
+                         collect: bool = True) -> list:
+    """
+    Ürünleri sayfa havuzu üzerinde eşzamanlı işler, sonuçlar giriş sırasındadır.
+    Her sonuç tamamlandığı anda session.record ile kaydedilir; büyük
+    listelerde collect=False ile sonuçlar bellekte biriktirilmez.
+    """
+    async with session.new_pool(browser, concurrency, contexts) as pool:
+        session.stats.incr("pool_start_ms", pool.start_ms)
+        async def handle(product):
+            return await run_product(pool, product, session)
+
+        return await run_in_order(products, handle, concurrency=concurrency, collect=collect)
+
+async def load_listing_page(page: Page, url: str, listing: dict, session: TrackerSession) -> dict:
+    """Tek liste sayfasını açar ve tüm kartları tek evaluate ile çözer."""
+    response = await page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT)
+    if (response and response.status in THROTTLE_STATUSES) or is_block_url(page.url):
+        raise BlockedError(f"HTTP {response.status if response else '?'} ({urlparse(url).netloc})")
+    await page.wait_for_selector(listing["card"], timeout=READY_TIMEOUT)
+    found = await extract_cards(page, listing)
+    if session.blocker:
+        session.blocker.take_page_counts(page)
+    return found
+
+async def crawl_listing(pool: PagePool, url: str, session: TrackerSession,
+                        max_pages: int = LISTING_MAX_PAGES) -> int:
+    """
+    Kategori sayfasını sayfalama bitene kadar gezer; her ürün kartı için
+    process_product ile aynı biçimde bir sonuç kaydeder. Kart sayısını döndürür.
+    """
+    stats, limiter, breaker = session.stats, session.limiter, session.breaker
+    retry = session.retry or RetryPolicy(attempts=1)
+    scraper = get_scraper(url)
+    listing = scraper.spec.listing
+    if not listing:
+        print(f"[LISTING] {urlparse(url).netloc} için liste tanımı yok, atlanıyor")
+        return 0
+
+    seen, total = set(), 0
+    while url and len(seen) < max_pages and url not in seen:
+        seen.add(url)
+        domain = urlparse(url).netloc
+        if breaker and not breaker.allow(domain):
+            print(f"[SKIP] {url} -> {domain} devresi açık")
+            stats.incr("skipped")
+            break
+        print(f"[LISTING] {url}")
+        found = None
+        for attempt in range(1, retry.attempts + 1):
+            try:
+                async with session.throttle(domain):
+                    async with pool.page() as page:
+                        started = time.monotonic()
+                        found = await load_listing_page(page, url, listing, session)
+                        latency = time.monotonic() - started
+                if limiter:
+                    limiter.report(domain, ok=True, latency=latency)
+                if breaker:
+                    breaker.record_success(domain)
+                break
+            except Exception as e:
+                print(f"[ERROR] Liste sayfası hatası ({attempt}/{retry.attempts}): {str(e)[:80]}")
+                if limiter:
+                    limiter.report(domain, ok=False,
+                                   throttled=isinstance(e, (BlockedError, PlaywrightTimeoutError)))
+                if attempt == retry.attempts or (breaker and breaker.is_open(domain)):
+                    break
+                stats.incr("retries")
+                await asyncio.sleep(retry.delay(attempt))
+        if found is None:
+            stats.incr("error")
+            if breaker:
+                breaker.record_failure(domain)
+            break
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for card in found["cards"]:
+            title = (card.get("title") or "").strip() or "Başlık Bulunamadı"
+            price = (card.get("price") or "").strip() or "N/A"
+            stats.incr("products")
+            stats.incr("ok" if price != "N/A" else "error")
+            session.record({
+                "name": title,
+                "title": title,
+                "price": price,
+                "price_numeric": scraper.clean_price(price),
+                "currency": scraper.price_currency(price),
+                "availability": " ".join((card.get("stock") or "N/A").split()),
+                "url": card.get("url") or url,
+                "timestamp": timestamp,
+                "status": "[OK] Listeden" if price != "N/A" else "[ERROR] Kartta fiyat yok",
+            })
+        stats.incr("listing_pages")
+        stats.incr("listing_cards", len(found["cards"]))
+        total += len(found["cards"])
+        url = found["next"]
+    return total
+
+async def run_listings(browser, urls, session: TrackerSession, concurrency: int = CONCURRENCY,
+                       contexts: int = BROWSER_CONTEXTS, max_pages: int = LISTING_MAX_PAGES):
+    """Kategori adreslerini eşzamanlı tarar; her kategorinin sayfaları sırayla gezilir."""
+    async with session.new_pool(browser, concurrency, contexts) as pool:
+        session.stats.incr("pool_start_ms", pool.start_ms)
+        async def handle(url):
+            return await crawl_listing(pool, url, session, max_pages)
+
+        await run_in_order(urls, handle, concurrency=concurrency, collect=False)
+
+async def run_daemon(browser, products, session: TrackerSession, concurrency: int = CONCURRENCY,
+                     contexts: int = BROWSER_CONTEXTS):
+    """
+    Ürünleri kendi aralıklarıyla süresiz yeniler (bkz. tracker/scheduler.py).
+    Fiyatı değişen ürünler daha sık, sabit kalanlar daha seyrek çekilir.
+    """
+    scheduler = Scheduler(products)
+    running = set()
+    last_summary = time.monotonic()
+    print(f"[DAEMON] {len(scheduler)} ürün zamanlandı")
+
+    async with session.new_pool(browser, concurrency, contexts) as pool:
+        session.stats.incr("pool_start_ms", pool.start_ms)
+        async def run_one(item):
+            url = item.product["url"]
+            changed = False
+            try:
+                previous = session.history.latest(url) if session.history else None
+                result = await run_product(pool, item.product, session)
+                changed = (previous is not None
+                           and result["status"].startswith("[OK]")
+                           and previous["status"].startswith("[OK]")
+                           and result["price_numeric"] != previous["price_numeric"])
+            except Exception as e:
+                # Örn. sqlite "database is locked": ürün daemon'dan düşmesin
+                print(f"[DAEMON] {item.product['name']} işlenemedi: {str(e)[:80]}")
+                session.stats.incr("daemon_errors")
+            finally:
+                scheduler.reschedule(item, changed)
+            print(f"[DAEMON] {item.product['name']} -> sonraki {item.interval / 60:.0f} dk sonra")
+
+        while True:
+            # Havuzu çok aşmayacak kadar iş başlat, gerisi kuyrukta beklesin
+            for item in scheduler.pop_due(limit=concurrency * 2 - len(running)):
+                task = asyncio.create_task(run_one(item))
+                running.add(task)
+                task.add_done_callback(running.discard)
+
+            if time.monotonic() - last_summary >= DAEMON_SUMMARY_EVERY:
+                session.stats.print_summary()
+                last_summary = time.monotonic()
+
+            await asyncio.sleep(min(scheduler.next_due_in(), DAEMON_TICK))
+
+async def run_queue_node(browser, queue: WorkQueue, session: TrackerSession, node_id: str,
+                         concurrency: int = CONCURRENCY, contexts: int = BROWSER_CONTEXTS):
+    """
+    Dağıtık kuyruktan kiralayarak çalışır (bkz. tracker/workqueue.py).
+    Kuyrukta bekleyen ya da kirada iş kalmayınca döner. Sonuç sadece kira
+    hâlâ bu düğümdeyse kaydedilir, böylece her URL bir kez yazılır.
+    Kuyruk çağrıları (30 sn'ye kadar kilit beklemesi) thread'de çalışır.
+    """
+    in_flight = {}
+    tasks = set()
+    print(f"[QUEUE] Düğüm {node_id} başladı, kalan iş: {await asyncio.to_thread(queue.remaining)}")
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(QUEUE_HEARTBEAT)
+            lost = await asyncio.to_thread(queue.heartbeat, list(in_flight.values()), QUEUE_LEASE_SECONDS)
+            for job in lost:
+                print(f"[QUEUE] {job.product['name']} kirası başka düğüme geçti")
+
+    async with session.new_pool(browser, concurrency, contexts) as pool:
+        session.stats.incr("pool_start_ms", pool.start_ms)
+        async def work(job):
+            try:
+                result = await run_product(pool, job.product, session, record=False)
+                # Aynı anahtar kuyruktaki sonuçla geçmişteki gözlemi eşler
+                result["source"] = job.key
+                if await asyncio.to_thread(queue.complete, job, node_id, result):
+                    session.record(result)
+                else:
+                    session.stats.incr("lease_lost")
+            finally:
+                in_flight.pop(job.id, None)
+
+        beat = asyncio.create_task(heartbeat())
+        try:
+            while True:
+                jobs = await asyncio.to_thread(queue.lease, node_id, concurrency - len(in_flight),
+                                               QUEUE_LEASE_SECONDS)
+                for job in jobs:
+                    in_flight[job.id] = job
+                    task = asyncio.create_task(work(job))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                # Başka düğümlerdeki kiralar düşerse bize geri gelebilir, bitene kadar bekle
+                if not in_flight and await asyncio.to_thread(queue.remaining) == 0:
+                    break
+                await asyncio.sleep(QUEUE_POLL)
+        finally:
+            beat.cancel()
+            for task in tasks:
+                task.cancel()
+            # Yarım kalan işleri diğer düğümler beklemeden alabilsin
+            for job in list(in_flight.values()):
+                await asyncio.to_thread(queue.release, job)
+    # Tamamlanıp geçmişe yazılamamış sonuçlar (ör. kayıt hatası) kuyruktan tamamlanır
+    recovered = collect_results(queue, session.history, node_id)
+    if recovered:
+        print(f"[QUEUE] {recovered} sonuç kuyruktan geçmişe tamamlandı")
+    print(f"[QUEUE] Düğüm {node_id} bitti: {queue.counts()}")
+
+def collect_results(queue: WorkQueue, history: PriceHistory, node_id: str = None) -> int:
+    """
+    Kuyruktaki sonuçları (verilirse sadece node_id'ninkileri) geçmişe
+    ekler; zaten kayıtlı olanlar anahtarlarıyla atlanır. Eklenen sayıyı döndürür.
+    """
+    added = 0
+    for key, result in queue.iter_results(node_id):
+        result["source"] = key
+        added += history.add(result)
+    return added
+
+def process_worker(worker_id: int, generation: int, inbox, results, concurrency: int,
+                   snapshots: bool = SNAPSHOTS, browser_endpoint: str = BROWSER_ENDPOINT):
+    """İşçi süreci: kendi Chromium'unu açar (ya da sunucuya bağlanır), gelen kutusundaki ürünleri işler."""
+    asyncio.run(_process_worker(worker_id, generation, inbox, results, concurrency, snapshots,
+                                browser_endpoint))
+
+async def _process_worker(worker_id, generation, inbox, results, concurrency, snapshots, browser_endpoint):
+    session = TrackerSession.from_settings(history=False, snapshots=snapshots)
+    last_counters = {}
+
+    def counters_delta() -> dict:
+        # Süre ölçümleri işçinin kendi çıktısında kalır; ana süreçte toplanmaz
+        current = {k: v for k, v in session.stats.counters.items() if k not in TIMING_KEYS}
+        delta = {k: v - last_counters.get(k, 0) for k, v in current.items() if v != last_counters.get(k, 0)}
+        last_counters.update(current)
+        return delta
+
+    try:
+        async with async_playwright() as p:
+            browser = await connect_browser(p, browser_endpoint, headless=True, stats=session.stats)
+            async with session.new_pool(browser, concurrency) as pool:
+                session.stats.incr("pool_start_ms", pool.start_ms)
+                async def consume():
+                    while True:
+                        job = await asyncio.to_thread(inbox.get)
+                        if job is None:
+                            # Aynı süreçteki diğer tüketiciler de dursun
+                            inbox.put(None)
+                            return
+                        job_id, product = job
+                        result = await run_product(pool, product, session)
+                        results.send(("result", job_id, result, counters_delta()))
+
+                await asyncio.gather(*(consume() for _ in range(concurrency)))
+            await browser.close()
+    finally:
+        session.close()
+
+async def run_multiprocess(products, session: TrackerSession, workers: int,
+                           concurrency: int = CONCURRENCY, snapshots: bool = SNAPSHOTS,
+                           browser_endpoint: str = BROWSER_ENDPOINT):
+    """Ürünleri N işçi sürecine dağıtır; sonuçlar bu süreçte kaydedilir."""
+    runner = ProcessPoolRunner(process_worker, workers=workers, slots=concurrency,
+                               memory_limit_mb=WORKER_MEMORY_MB,
+                               target_args=(concurrency, snapshots, browser_endpoint))
+    session.stats.add_reporter(runner.summary_lines)
+
+    def on_result(result: dict, counters: dict):
+        session.record(result)
+        for key, amount in counters.items():
+            session.stats.incr(key, amount)
+
+    def on_lost(product: dict):
+        print(f"[WORKER] {product['name']} işçiyi tekrar tekrar düşürdü, atlanıyor")
+        session.stats.incr("products")
+        session.stats.incr("error")
+        session.record(failed_result(product, "HATA", "[ERROR] İşçi süreci çöktü"))
+
+    await runner.run(products, on_result, on_lost)
+
+def repair_from_snapshots(session: TrackerSession, since: str = None, workers: int = None):
+    """Arşivdeki sayfaları tüm çekirdeklerde yeniden çözer ve geçmişi onarır."""
+    started = time.monotonic()
+    repaired = added = failed = 0
+    for result in reextract(session.snapshots, workers=workers, since=since):
+        if result["status"].startswith("[ERROR]"):
+            # Eski selector'larla alınmış veri bozuk sonuçla ezilmesin
+            failed += 1
+            continue
+        if session.history.repair(result):
+            repaired += 1
+        else:
+            added += 1
+    elapsed = time.monotonic() - started
+    print(f"[REEXTRACT] {repaired} gözlem onarıldı, {added} eklendi, {failed} çözülemedi "
+          f"({elapsed:.1f} sn)")
+    session.stats.incr("reextracted", repaired + added)
+
+def shard_arg(text: str) -> tuple:
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def export_arg(filename: str) -> str:
+    """Çıktı uzantısını tarama başlamadan doğrular."""
+    try:
+        export_format(filename)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return filename
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-site e-ticaret fiyat takip botu")
+    parser.add_argument("--watchlist",
+                        help="İzleme listesi (.csv, .jsonl, .xlsx); verilmezse PRODUCTS_TO_TRACK")
+    parser.add_argument("--shard", type=shard_arg, metavar="i/N",
+                        help="Listenin sadece i. parçasını işle (0 <= i < N)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Ürünleri kendi aralıklarıyla süresiz takip et")
+    parser.add_argument("--export", type=export_arg, default=EXPORT_FILE,
+                        help="Çıktı dosyası (.xlsx, .csv ya da .parquet)")
+    parser.add_argument("--full-history", action="store_true",
+                        help="Sadece son fiyatları değil tüm gözlemleri dışa aktar")
+    parser.add_argument("--queue", metavar="DB",
+                        help="Ortak kiralamalı iş kuyruğu (SQLite dosyası); düğümler birlikte tüketir")
+    parser.add_argument("--enqueue", action="store_true",
+                        help="İzleme listesini --queue kuyruğuna ekle (bekleyen URL tekrar eklenmez, "
+                             "bitmiş olan yeniden beklemeye alınır)")
+    parser.add_argument("--collect", action="store_true",
+                        help="--queue kuyruğundaki tüm düğümlerin sonuçlarını geçmişe topla ve dışa aktar")
+    parser.add_argument("--node-id", default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Kuyruktaki düğüm adı")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                        help="Aynı anda açık sayfa sayısı (--workers ile işçi başına)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="N ayrı süreçte, her biri kendi Chromium'uyla çalış")
+    parser.add_argument("--snapshots", action="store_true", default=SNAPSHOTS,
+                        help=f"Görülen sayfaları sıkıştırılmış olarak arşivle ({SNAPSHOT_DIR}/)")
+    parser.add_argument("--reextract", action="store_true",
+                        help="Ağa çıkmadan arşivdeki sayfaları güncel selector'larla yeniden çöz")
+    parser.add_argument("--since", metavar="ZAMAN",
+                        help="--reextract için başlangıç zamanı (ör. 2024-05-01)")
+    parser.add_argument("--listing", action="append", metavar="URL",
+                        help="Kategori/arama sayfasını sayfalamayla tara, kart başına sonuç (tekrarlanabilir)")
+    parser.add_argument("--max-pages", type=int, default=LISTING_MAX_PAGES,
+                        help="--listing için kategori başına en fazla sayfa")
+    parser.add_argument("--renormalize", action="store_true",
+                        help="Geçmişteki tüm fiyat metinlerini güncel kurallarla yeniden sayıya çevir")
+    parser.add_argument("--resume", action="store_true",
+                        help="Kesilen son çalıştırmayı sürdür; orada tamamlanan URL'leri atla")
+    parser.add_argument("--browser-endpoint", default=BROWSER_ENDPOINT, metavar="URL",
+                        help="Çalışan tarayıcı sunucusuna bağlan (ws://... run-server, http://... CDP)")
+    return parser.parse_args(argv)
+
+def load_products(args):
+    """İzleme listesini lazy olarak (ve gerekirse shard'a göre süzerek) döndürür."""
+    products = iter_watchlist(args.watchlist) if args.watchlist else iter(PRODUCTS_TO_TRACK)
+    if args.shard:
+        index, total = args.shard
+        print(f"[SHARD] {index}/{total} parçası işleniyor")
+        products = shard(products, index, total)
+    return products
+
+def run_label(args) -> str:
+    """
+    Aynı listenin (ve shard'ın) çalıştırmalarını eşleştiren etiket.
+    Sürdürülemeyen kipler (daemon, kategori, kuyruk, arşiv) kendi önekini
+    alır; hiç bitmeyen bir daemon çalıştırması --resume'a karışmaz.
+    """
+    label = args.watchlist or "PRODUCTS_TO_TRACK"
+    if args.shard:
+        label += f" [{args.shard[0]}/{args.shard[1]}]"
+    if args.reextract:
+        return "reextract"
+    if args.listing:
+        return "listing: " + ", ".join(args.listing)
+    if args.queue:
+        return f"queue: {args.queue}"
+    if args.daemon:
+        return "daemon: " + label
+    return label
+
+def skip_completed(products, completed: set, stats: RunStats):
+    """Kesilen çalıştırmada zaten tamamlanmış URL'leri atlar."""
+    for product in products:
+        if product["url"] in completed:
+            stats.incr("resumed")
+            continue
+        yield product
+
+async def main(argv=None):
+    args = parse_args(argv)
+    if args.renormalize:
+        history = PriceHistory(HISTORY_DB)
+        started = time.monotonic()
+        updated, invalid = history.renormalize()
+        history.close()
+        print(f"[PRICE] {updated} gözlem güncellendi, {invalid} fiyat çözülemedi "
+              f"({time.monotonic() - started:.1f} sn)")
+        return
+    if sum(map(bool, (args.daemon, args.workers, args.queue, args.reextract, args.listing))) > 1:
+        raise SystemExit("--daemon, --workers, --queue, --reextract ve --listing birlikte kullanılamaz")
+    if args.collect and not args.queue:
+        raise SystemExit("--collect için --queue gerekli")
+    if args.resume and (args.daemon or args.queue or args.reextract or args.listing):
+        raise SystemExit("--resume sadece tek seferlik liste taramasında (ve --workers ile) kullanılır")
     print("Bot Başlatılıyor...")
-    async with async_playwright() as p:
-        # Görünür modda başlat (headless=False)
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        page = await context.new_page()
-        
-        results = []
-        for product in PRODUCTS_TO_TRACK:
-            res = await process_product(page, product)
-            results.append(res)
+    products = load_products(args)
+    queue = open_queue(args.queue) if args.queue else None
+    if queue and args.enqueue:
+        print(f"[QUEUE] {queue.enqueue(products)} iş kuyruğa alındı")
+    session = TrackerSession.from_settings(snapshots=args.snapshots or args.reextract)
+    history = session.history
+    if args.resume:
+        run_id = history.resume_run(run_label(args))
+        completed = history.completed_urls()
+        print(f"[RESUME] Çalıştırma #{run_id} sürdürülüyor, {len(completed)} URL zaten tamamlanmış")
+        products = skip_completed(products, completed, session.stats)
+    else:
+        history.start_run(run_label(args))
+    try:
+        if args.reextract:
+            repair_from_snapshots(session, since=args.since)
+        elif args.collect:
+            print(f"[QUEUE] {collect_results(queue, history)} sonuç kuyruktan geçmişe eklendi")
+        elif args.workers:
+            # Her işçi kendi Chromium'unu açar, bu süreç sadece dağıtır ve kaydeder
+            await run_multiprocess(products, session, args.workers, concurrency=args.concurrency,
+                                   snapshots=args.snapshots, browser_endpoint=args.browser_endpoint)
+        else:
+            async with async_playwright() as p:
+                # Görünür modda başlat (headless=False)
+                browser = await connect_browser(p, args.browser_endpoint, headless=False,
+                                                stats=session.stats)
+                
+                if args.daemon:
+                    await run_daemon(browser, products, session, concurrency=args.concurrency)
+                elif args.listing:
+                    await run_listings(browser, args.listing, session, concurrency=args.concurrency,
+                                       max_pages=args.max_pages)
+                elif queue:
+                    await run_queue_node(browser, queue, session, args.node_id,
+                                         concurrency=args.concurrency)
+                else:
+                    await track_products(browser, products, session, concurrency=args.concurrency,
+                                         collect=False)
+                    
+                await browser.close()
             
-        await browser.close()
-        
-    save_to_excel(results)
+        # Çıktı, depodaki gözlemlerden akışlı olarak üretilir
+        rows = history.iter_all() if args.full_history else history.iter_latest()
+        await export_rows(aiter_rows(rows), args.export)
+        history.finish_run()
+    finally:
+        session.close()
+        if queue:
+            queue.close()
+    session.stats.print_summary()
 
 if __name__ == "__main__":
     asyncio.run(main())
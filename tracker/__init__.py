@@ -0,0 +1 @@
+# Tracker package
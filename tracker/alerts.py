@@ -0,0 +1,339 @@
+"""
+Price Tracker - Fiyat Alarmları
+===============================
+Her yeni sonuç kaydedilirken kurallar artımlı olarak değerlendirilir.
+Kural durumu (son fiyat/stok, N günlük minimum, grup en ucuzu) URL
+başına tutulur; gözlem başına maliyet toplam ürün ya da kural
+sayısından bağımsızdır (URL'ye özel kurallar sözlükten, genel
+kurallar tek listeden gelir).
+
+Kural dosyası (JSON listesi), "url" verilmeyen kural tüm ürünlere uygulanır:
+    [
+        {"type": "threshold", "url": "https://...", "below": 25000},
+        {"type": "drop", "percent": 10, "days": 30},
+        {"type": "back_in_stock"},
+        {"type": "cheapest", "group": "iphone-15-128", "urls": ["https://...", "https://..."]},
+        {"type": "cheapest"}
+    ]
+
+"cheapest" aynı ürünün farklı sitelerdeki URL'lerini bir grup sayar ve
+en ucuz site değiştiğinde alarm üretir. Grup açıkça verilir: kuraldaki
+"urls" listesi ya da (urls'siz kuralda) izleme listesindeki "group"
+sütunu. Grubu olmayan sonuç karşılaştırılmaz. Başarısız ya da fiyatı
+okunamayan site, eski fiyatıyla en ucuz sayılmasın diye gruptan çıkar.
+
+Isınma, her URL'nin pencereden önceki son geçerli gözlemiyle son
+fiyat/stok durumunu tohumlar, sonra en uzun "drop" penceresi kadar
+geçmişi okur (warmup_days).
+
+Alarmlar sink'lere gider: "console", "jsonl:dosya.jsonl",
+"webhook:https://..." ya da "price_tracker.alert_sinks" entry point
+grubundan yüklenen, send(alert) metodu olan nesneler.
+"""
+
+import json
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+SINK_PLUGIN_GROUP = "price_tracker.alert_sinks"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+IN_STOCK_MARKERS = ("stokta var", "in stock", "sepete ekle", "kargoya")
+OUT_OF_STOCK_MARKERS = ("tükendi", "stok yok", "out of stock", "stokta yok", "unavailable")
+
+
+def in_stock(availability: str):
+    """Stok metnini True/False'a çevirir; anlaşılamazsa None."""
+    text = (availability or "").lower()
+    if any(marker in text for marker in OUT_OF_STOCK_MARKERS):
+        return False
+    if any(marker in text for marker in IN_STOCK_MARKERS):
+        return True
+    return None
+
+
+# ==========================================
+# SINK'LER
+# ==========================================
+
+class ConsoleSink:
+    def send(self, alert: dict):
+        print(f"[ALERT] {alert['name']}: {alert['message']} -> {alert['url']}")
+
+
+class JsonlSink:
+    """Her alarmı bir JSON satırı olarak dosyaya ekler."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def send(self, alert: dict):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+
+
+class WebhookSink:
+    """Alarmı JSON olarak POST eder; istekler arka plan thread'inde gider."""
+
+    def __init__(self, url: str, timeout: float = 10):
+        import requests
+
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def _post(self, alert: dict):
+        try:
+            self.session.post(self.url, json=alert, timeout=self.timeout)
+        except Exception as e:
+            print(f"[ALERT] Webhook gönderilemedi: {str(e)[:60]}")
+
+    def send(self, alert: dict):
+        self.executor.submit(self._post, alert)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+
+def make_sink(spec: str):
+    """"console", "jsonl:yol" ya da "webhook:url" tanımından sink üretir."""
+    kind, _, target = spec.partition(":")
+    if kind == "console":
+        return ConsoleSink()
+    if kind == "jsonl":
+        return JsonlSink(target or "alarmlar.jsonl")
+    if kind == "webhook":
+        return WebhookSink(target)
+    raise ValueError(f"Bilinmeyen alarm sink'i: {spec}")
+
+
+def load_sink_plugins(group: str = SINK_PLUGIN_GROUP) -> list:
+    from importlib.metadata import entry_points
+
+    sinks = []
+    for entry_point in entry_points(group=group):
+        try:
+            plugin = entry_point.load()
+            sinks.append(plugin() if isinstance(plugin, type) else plugin)
+            print(f"[ALERT] Sink eklentisi yüklendi: {entry_point.name}")
+        except Exception as e:
+            print(f"[ALERT] Sink eklentisi yüklenemedi: {entry_point.name} ({e})")
+    return sinks
+
+
+# ==========================================
+# KURAL MOTORU
+# ==========================================
+
+class RollingMin:
+    """Zaman pencereli minimum; monoton deque ile gözlem başına amortize O(1)."""
+
+    __slots__ = ("window", "items")
+
+    def __init__(self, days: int):
+        self.window = timedelta(days=days)
+        self.items = deque()    # (zaman, fiyat), fiyatlar artan sırada
+
+    def minimum(self, now: datetime):
+        while self.items and self.items[0][0] < now - self.window:
+            self.items.popleft()
+        return self.items[0][1] if self.items else None
+
+    def push(self, now: datetime, price: float):
+        while self.items and self.items[-1][1] >= price:
+            self.items.pop()
+        self.items.append((now, price))
+
+
+# Kural tipi -> (zorunlu sayısal alanlar, isteğe bağlı sayısal alanlar)
+RULE_FIELDS = {
+    "threshold": (("below",), ()),
+    "drop": (("percent",), ("days",)),
+    "back_in_stock": ((), ()),
+    "cheapest": ((), ()),
+}
+
+
+def validate_rule(rule: dict):
+    """Kuralı yüklenirken denetler; observe sırasında KeyError çıkmasın."""
+    if not isinstance(rule, dict) or rule.get("type") not in RULE_FIELDS:
+        raise ValueError(f"Bilinmeyen alarm kuralı: {rule}")
+    required, optional = RULE_FIELDS[rule["type"]]
+    for key in required + tuple(key for key in optional if key in rule):
+        value = rule.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError(f"Alarm kuralında '{key}' pozitif bir sayı olmalı: {rule}")
+    urls = rule.get("urls")
+    if urls is not None and (not isinstance(urls, list) or not all(isinstance(u, str) for u in urls)):
+        raise ValueError(f"Alarm kuralında 'urls' URL listesi olmalı: {rule}")
+
+
+class AlertEngine:
+    """Kuralları her sonuçta artımlı değerlendirir ve alarmları sink'lere yollar."""
+
+    def __init__(self, rules: list, sinks: list = None):
+        self.global_rules = []
+        self.url_rules = defaultdict(list)
+        for rule in rules:
+            validate_rule(rule)
+            if rule.get("urls"):
+                # Gruplu kural sadece kendi URL'lerinde çalışır
+                for url in rule["urls"]:
+                    self.url_rules[url].append(rule)
+            elif rule.get("url"):
+                self.url_rules[rule["url"]].append(rule)
+            else:
+                self.global_rules.append(rule)
+        self.sinks = sinks if sinks is not None else [ConsoleSink()]
+        self.last_price = {}
+        self.last_stock = {}
+        self.minimums = {}                    # (url, gün) -> RollingMin
+        self.groups = defaultdict(dict)       # grup -> {url: fiyat}
+        self.cheapest = {}                    # grup -> url
+        self.sent = defaultdict(int)
+
+    @classmethod
+    def from_file(cls, path: str, sinks: list = None) -> "AlertEngine":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), sinks)
+
+    @property
+    def warmup_days(self) -> int:
+        """Isınmada okunacak gün: en uzun "drop" penceresi (yoksa 1 gün)."""
+        rules = self.global_rules + [rule for rules in self.url_rules.values() for rule in rules]
+        return max([rule.get("days", 30) for rule in rules if rule["type"] == "drop"], default=1)
+
+    def _rules(self, url: str) -> list:
+        specific = self.url_rules.get(url)
+        return self.global_rules + specific if specific else self.global_rules
+
+    def _minimum(self, url: str, days: int) -> RollingMin:
+        key = (url, days)
+        if key not in self.minimums:
+            self.minimums[key] = RollingMin(days)
+        return self.minimums[key]
+
+    @staticmethod
+    def _group_key(rule: dict, result: dict):
+        """cheapest grubu: kuraldaki "group" (yoksa ilk URL) ya da sonucun "group" alanı."""
+        if rule.get("urls"):
+            return rule.get("group") or rule["urls"][0]
+        return result.get("group")
+
+    def _leave_groups(self, url: str, result: dict):
+        """Fiyatı geçersiz URL'yi gruplarından çıkarır; liderse yeni lider seçilir."""
+        for rule in self._rules(url):
+            if rule["type"] != "cheapest":
+                continue
+            key = self._group_key(rule, result)
+            group = self.groups.get(key)
+            if not group or group.pop(url, None) is None:
+                continue
+            if self.cheapest.get(key) == url:
+                if group:
+                    self.cheapest[key] = min(group, key=group.get)
+                else:
+                    self.cheapest.pop(key, None)
+
+    def observe(self, result: dict, alert: bool = True) -> list:
+        """
+        Sonucu kural durumuna işler; alert=True ise tetiklenen alarmları
+        sink'lere gönderir ve döndürür (alert=False: geçmişten ısınma).
+        """
+        url, price = result["url"], result.get("price_numeric")
+        if result.get("anomaly"):
+            return []
+        ok = (result.get("status") or "").startswith("[OK]")
+        valid = ok and price is not None and price > 0
+        if not valid:
+            self._leave_groups(url, result)
+        if not ok:
+            return []
+        now = datetime.strptime(result["timestamp"], TIME_FORMAT)
+        stock = in_stock(result.get("availability"))
+        alerts = []
+
+        for rule in self._rules(url):
+            kind = rule["type"]
+            if kind == "threshold" and valid:
+                below = rule["below"]
+                previous = self.last_price.get(url)
+                # Sadece eşiğin altına inildiği anda (her gözlemde değil)
+                if price <= below and (previous is None or previous > below):
+                    alerts.append((rule, f"Fiyat {price:,.2f} <= {below:,.2f}"))
+            elif kind == "drop" and valid:
+                window = self._minimum(url, rule.get("days", 30))
+                minimum = window.minimum(now)
+                limit = minimum * (1 - rule["percent"] / 100) if minimum else None
+                if limit and price <= limit:
+                    alerts.append((rule, f"{rule.get('days', 30)} günlük minimum {minimum:,.2f}, "
+                                         f"yeni fiyat {price:,.2f} (%{(1 - price / minimum) * 100:.0f} düşüş)"))
+            elif kind == "back_in_stock":
+                if stock and self.last_stock.get(url) is False:
+                    alerts.append((rule, "Tekrar stokta"))
+            elif kind == "cheapest" and valid:
+                key = self._group_key(rule, result)
+                if key is None:
+                    continue
+                group = self.groups[key]
+                group[url] = price
+                leader = min(group, key=group.get)
+                if len(group) > 1 and leader == url and self.cheapest.get(key) != url:
+                    alerts.append((rule, f"{len(group)} site içinde en ucuz ({price:,.2f})"))
+                self.cheapest[key] = leader
+
+        # Durum güncellemesi kurallardan sonra: karşılaştırmalar öncekiyle yapılır
+        if valid:
+            self.last_price[url] = price
+            for window in self._url_windows(url):
+                window.push(now, price)
+        if stock is not None:
+            self.last_stock[url] = stock
+
+        if not alert:
+            return []
+        sent = []
+        for rule, message in alerts:
+            payload = {
+                "rule": rule["type"],
+                "name": result["name"],
+                "url": url,
+                "price": price,
+                "availability": result.get("availability"),
+                "timestamp": result["timestamp"],
+                "message": message,
+            }
+            for sink in self.sinks:
+                try:
+                    sink.send(payload)
+                except Exception as e:
+                    print(f"[ALERT] {type(sink).__name__} hatası: {str(e)[:60]}")
+            self.sent[rule["type"]] += 1
+            sent.append(payload)
+        return sent
+
+    def _url_windows(self, url: str):
+        for rule in self._rules(url):
+            if rule["type"] == "drop":
+                yield self._minimum(url, rule.get("days", 30))
+
+    def warm_up(self, results):
+        """Geçmiş gözlemlerle durumu doldurur (alarm üretmeden)."""
+        for result in results:
+            self.observe(result, alert=False)
+
+    def summary_lines(self) -> list:
+        if not self.sent:
+            return []
+        return ["Alarm: " + ", ".join(f"{kind} {count}" for kind, count in sorted(self.sent.items()))]
+
+    def close(self):
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
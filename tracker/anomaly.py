@@ -0,0 +1,127 @@
+"""
+Price Tracker - Fiyat Anomalisi Tespiti
+=======================================
+Yanlış selector bazen taksit tutarını ya da üstü çizili liste fiyatını
+yakalar; bu, fiyatta ani 10 katlık sıçrama olarak görünür.
+
+Her URL için son `window` geçerli fiyat tek bir NumPy matrisinde halka
+tampon olarak tutulur. Yeni gözlem, pencerenin medyanı ve MAD'i
+(medyan mutlak sapma) ile karşılaştırılır; tam seri hiç yeniden
+taranmaz, gözlem başına maliyet pencere boyutuyla sınırlıdır.
+
+Anomali sayılan değer pencereye girmez. Ancak `confirm_after` gözlem
+üst üste aynı yönde sapma olursa bu gerçek bir fiyat değişimi kabul
+edilir ve pencere yeni seviyeden yeniden başlar.
+"""
+
+import numpy as np
+
+
+# MAD'i normal dağılım standart sapmasına çeviren katsayı
+MAD_SCALE = 1.4826
+# MAD sıfırken (sabit fiyat) her kuruşluk değişim anomali olmasın
+MIN_RELATIVE_SCALE = 0.02
+
+
+class AnomalyDetector:
+    """URL başına kayan medyan/MAD ile aykırı fiyat tespiti."""
+
+    def __init__(self, window: int = 20, threshold: float = 5.0, min_ratio: float = 2.0,
+                 min_points: int = 5, confirm_after: int = 3, capacity: int = 1024):
+        self.window = window
+        self.threshold = threshold
+        self.min_ratio = min_ratio
+        self.min_points = min_points
+        self.confirm_after = confirm_after
+        self.slots = {}     # url -> satır
+        self.values = np.full((capacity, window), np.nan)
+        self.position = np.zeros(capacity, dtype=np.int32)
+        self.count = np.zeros(capacity, dtype=np.int32)
+        self.streak = np.zeros(capacity, dtype=np.int32)
+        self.direction = np.zeros(capacity, dtype=np.int8)   # serinin yönü: +1 / -1
+        self.checked = 0
+        self.flagged = 0
+
+    def _slot(self, url: str) -> int:
+        slot = self.slots.get(url)
+        if slot is None:
+            slot = len(self.slots)
+            if slot == len(self.values):
+                self._grow()
+            self.slots[url] = slot
+        return slot
+
+    def _grow(self):
+        size = len(self.values) * 2
+        values = np.full((size, self.window), np.nan)
+        values[:len(self.values)] = self.values
+        self.values = values
+        for name in ("position", "count", "streak", "direction"):
+            array = getattr(self, name)
+            grown = np.zeros(size, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _push(self, slot: int, value: float):
+        self.values[slot, self.position[slot]] = value
+        self.position[slot] = (self.position[slot] + 1) % self.window
+        self.count[slot] = min(self.count[slot] + 1, self.window)
+
+    def _reset(self, slot: int):
+        self.values[slot] = np.nan
+        self.position[slot] = 0
+        self.count[slot] = 0
+        self.streak[slot] = 0
+        self.direction[slot] = 0
+
+    def warm_up(self, observations):
+        """(url, fiyat) çiftlerini eskiden yeniye pencereye yükler (kontrol etmeden)."""
+        for url, value in observations:
+            if value and value > 0:
+                self._push(self._slot(url), value)
+
+    def check(self, url: str, value: float) -> str:
+        """
+        Gözlemi değerlendirir ve pencereyi günceller.
+        Anomaliyse açıklama metni, değilse "" döndürür.
+        """
+        if value is None or not value > 0:
+            return ""
+        slot = self._slot(url)
+        self.checked += 1
+        count = self.count[slot]
+        if count < self.min_points:
+            self._push(slot, value)
+            return ""
+
+        window = self.values[slot, :count] if count < self.window else self.values[slot]
+        median = float(np.median(window))
+        mad = float(np.median(np.abs(window - median)))
+        scale = max(MAD_SCALE * mad, MIN_RELATIVE_SCALE * median)
+        score = abs(value - median) / scale
+        ratio = max(value / median, median / value)
+        if score <= self.threshold or ratio < self.min_ratio:
+            self.streak[slot] = 0
+            self.direction[slot] = 0
+            self._push(slot, value)
+            return ""
+
+        # Yön değiştiren sapmalar (taksit, sonra liste fiyatı) seviye değişimi sayılmaz
+        direction = 1 if value > median else -1
+        if self.direction[slot] != direction:
+            self.streak[slot] = 0
+            self.direction[slot] = direction
+        self.streak[slot] += 1
+        if self.streak[slot] >= self.confirm_after:
+            # Üst üste sapma: gerçek seviye değişimi, pencere yeni değerle başlar
+            self._reset(slot)
+            self._push(slot, value)
+            return ""
+        self.flagged += 1
+        return f"Medyan {median:.2f}, {ratio:.1f}x sapma"
+
+    def summary_lines(self) -> list:
+        if not self.checked:
+            return []
+        return [f"Anomali: {self.flagged}/{self.checked} gözlem işaretlendi "
+                f"({len(self.slots)} ürün izleniyor)"]
@@ -0,0 +1,124 @@
+"""
+Price Tracker - İstek Engelleme Profilleri
+==========================================
+context.route ile scraper'ların kullanmadığı ağır kaynakları (görsel,
+font, video) ve üçüncü parti izleyicileri engeller. Profiller domain
+bazındadır; allow_hosts listesi sadece host engelini (block_hosts) kaldırır,
+sayfanın çalışması için gereken bir alt alan adı izleyici kalıbına
+takılıyorsa kullanılır. Kaynak tipi engeli (görsel/font) her host için geçerlidir.
+
+Engellenen istekler hiç indirilmediği için kazanılan bayt, kaynak
+tipine göre ortalama boyutla tahmin edilir.
+"""
+
+from collections import defaultdict
+from urllib.parse import urlparse
+
+
+# Engellenen bir isteğin ortalama boyutu (bayt) - kazanç tahmini için
+AVG_BYTES = {
+    "image": 45_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 10_000,
+}
+
+TRACKER_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "adservice.google", "facebook.net", "connect.facebook",
+    "hotjar.com", "criteo.com", "criteo.net", "clarity.ms", "nr-data.net",
+    "useinsider.com", "mc.yandex.ru", "analytics.tiktok.com", "scorecardresearch.com",
+]
+
+DEFAULT_PROFILE = {
+    "block_types": ["image", "media", "font"],
+    "block_hosts": TRACKER_HOSTS,
+    "allow_hosts": [],
+}
+
+# get_scraper ile aynı domain anahtarları
+PROFILES = {
+    "amazon": {
+        "block_types": ["image", "media", "font"],
+        "block_hosts": TRACKER_HOSTS + ["fls-eu.amazon", "unagi.amazon", "aax-eu.amazon"],
+        "allow_hosts": [],
+    },
+    "trendyol": {
+        "block_types": ["image", "media", "font"],
+        "block_hosts": TRACKER_HOSTS + ["pixel.trendyol", "collector.trendyol"],
+        "allow_hosts": [],
+    },
+    "hepsiburada": {
+        "block_types": ["image", "media", "font"],
+        "block_hosts": TRACKER_HOSTS + ["trc.hepsiburada", "hbtrack"],
+        "allow_hosts": [],
+    },
+}
+
+
+def get_profile(domain: str) -> dict:
+    for key, profile in PROFILES.items():
+        if key in domain:
+            return profile
+    return DEFAULT_PROFILE
+
+
+class ResourceBlocker:
+    """Context'lere route kurar, sayfa ve domain bazında kazancı sayar."""
+
+    def __init__(self):
+        self.pages = defaultdict(lambda: {"requests": 0, "bytes": 0})
+        self.domains = defaultdict(lambda: {"requests": 0, "bytes": 0})
+
+    async def attach(self, context):
+        """PagePool'un context kurulum kancası olarak kullanılır."""
+        await context.route("**/*", self._handle)
+
+    def should_block(self, request, domain: str) -> bool:
+        if request.resource_type == "document":
+            return False
+        profile = get_profile(domain)
+        if request.resource_type in profile["block_types"]:
+            return True
+        # CDN'ler (cdn.dsmcdn.com, images.hepsiburada.net) görsel ve font da
+        # sunar; muafiyet tipe değil sadece host engeline uygulanır
+        host = urlparse(request.url).netloc
+        if any(allowed in host for allowed in profile["allow_hosts"]):
+            return False
+        return any(blocked in host for blocked in profile["block_hosts"])
+
+    async def _handle(self, route):
+        request = route.request
+        try:
+            page = request.frame.page
+            domain = urlparse(page.url).netloc
+        except Exception:
+            page, domain = None, ""
+
+        if not self.should_block(request, domain):
+            await route.continue_()
+            return
+
+        saved = AVG_BYTES.get(request.resource_type, AVG_BYTES["other"])
+        if page is not None:
+            self.pages[page]["requests"] += 1
+            self.pages[page]["bytes"] += saved
+        self.domains[domain]["requests"] += 1
+        self.domains[domain]["bytes"] += saved
+        await route.abort()
+
+    def take_page_counts(self, page) -> dict:
+        """Sayfanın son okumadan beri engellenen istek/bayt sayısını döndürür ve sıfırlar."""
+        return self.pages.pop(page, {"requests": 0, "bytes": 0})
+
+    def summary_lines(self) -> list:
+        lines = []
+        for domain, counts in sorted(self.domains.items()):
+            lines.append(
+                f"Engellenen {domain or '?'}: {counts['requests']} istek "
+                f"(~{counts['bytes'] / 1_000_000:.1f} MB)"
+            )
+        return lines
@@ -0,0 +1,98 @@
+"""
+Price Tracker - Sıcak Başlangıç
+===============================
+- connect_browser: uzun ömürlü bir tarayıcı sunucusuna bağlanır
+  (ws:// -> `playwright run-server --port 3000`, http:// -> CDP ile
+  --remote-debugging-port açık Chrome), yoksa yeni Chromium başlatır.
+- StorageStateStore: context'in storage_state'ini (çerezler, localStorage)
+  domain başına ayrı dosyalarda saklar ve sonraki çalıştırmada geri
+  yükler; böylece çerez/onay pencereleri her seferinde tekrar çıkmaz.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from tracker.registry import normalize_host
+
+
+async def connect_browser(playwright, endpoint: str = None, headless: bool = False, stats=None):
+    """Tarayıcıyı açar ya da sunucuya bağlanır; süreyi stats'a yazar."""
+    started = time.monotonic()
+    if endpoint and endpoint.startswith(("http://", "https://")):
+        browser = await playwright.chromium.connect_over_cdp(endpoint)
+    elif endpoint:
+        browser = await playwright.chromium.connect(endpoint)
+    else:
+        browser = await playwright.chromium.launch(headless=headless)
+    elapsed = (time.monotonic() - started) * 1000
+    mode = "sıcak" if endpoint else "soğuk"
+    print(f"[BROWSER] {mode} başlangıç: {elapsed:.0f} ms")
+    if stats is not None:
+        stats.incr(f"browser_start_ms_{'warm' if endpoint else 'cold'}", elapsed)
+    return browser
+
+
+def _cookie_host(cookie: dict) -> str:
+    return normalize_host(cookie.get("domain", "").lstrip("."))
+
+
+def _origin_host(origin: dict) -> str:
+    return normalize_host(origin.get("origin", ""))
+
+
+class StorageStateStore:
+    """Domain başına storage_state dosyaları (oturumlar/<host>.json)."""
+
+    def __init__(self, directory: str = "oturumlar"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.restored = 0
+        self.saved = 0
+
+    def _path(self, host: str) -> Path:
+        return self.directory / f"{host}.json"
+
+    def load_merged(self) -> dict:
+        """Tüm domainlerin durumunu tek bir storage_state olarak birleştirir."""
+        merged = {"cookies": [], "origins": []}
+        self.restored = 0
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                print(f"[STATE] {path.name} okunamadı, atlandı")
+                continue
+            merged["cookies"].extend(state.get("cookies", []))
+            merged["origins"].extend(state.get("origins", []))
+            self.restored += 1
+        return merged if self.restored else None
+
+    def context_options(self) -> dict:
+        state = self.load_merged()
+        return {"storage_state": state} if state else {}
+
+    async def capture(self, context):
+        """Context kapanmadan önce durumunu domainlere bölerek kaydeder."""
+        try:
+            state = await context.storage_state()
+        except Exception as e:
+            print(f"[STATE] Oturum durumu alınamadı: {e}")
+            return
+        by_host = {}
+        for cookie in state.get("cookies", []):
+            by_host.setdefault(_cookie_host(cookie), {"cookies": [], "origins": []})["cookies"].append(cookie)
+        for origin in state.get("origins", []):
+            by_host.setdefault(_origin_host(origin), {"cookies": [], "origins": []})["origins"].append(origin)
+        for host, host_state in by_host.items():
+            if not host:
+                continue
+            path = self._path(host)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(host_state, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        self.saved = len(by_host)
+
+    def summary_lines(self) -> list:
+        return [f"Oturum durumu: {self.restored} domain geri yüklendi, {self.saved} domain kaydedildi"]
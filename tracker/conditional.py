@@ -0,0 +1,184 @@
+"""
+Price Tracker - Koşullu İstek Durumu
+====================================
+HTTP kademesi için URL başına doğrulayıcıları (ETag, Last-Modified),
+ham HTML'deki alan bölgesinin özetini, çıkarılan alanların özetini ve
+son çözülen veriyi saklar.
+
+Sunucu 304 dönerse ya da bölge özeti değişmemişse sayfa hiç
+ayrıştırılmaz (lxml ağacı kurulmaz, selector çalışmaz); son veri
+"değişmedi" gözlemi olarak kaydedilir. Bölge özeti JSON-LD blokları,
+durum değişkeni script'leri ve alanların tüm yedek selector'larının
+eşleşebileceği elemanların (açılıştan kapanış etiketine) ham metninden
+hesaplanır. Bir selector basit değilse, adı çok sık geçiyorsa ya da
+elemanın kapanışı MAX_REGION_BYTES içinde bulunamıyorsa (değer bölge
+dışına taşabilir) özet yoktur ve sayfa her zamanki gibi çözülür.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from tracker.structured import LD_JSON_RE
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    field_hash    TEXT,
+    region_hash   TEXT,
+    data          TEXT,
+    updated_at    TEXT
+);
+"""
+
+
+# Bir eşleşmenin kapanış etiketine kadar en fazla bu kadar karakter taranır
+MAX_REGION_BYTES = 16384
+MAX_OCCURRENCES = 20
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "source", "track", "wbr"}
+
+# Basit selector'ın son parçası: "span.a-price-whole", "#productTitle",
+# '[data-test-id="price-current-price"]', "h1"
+_SIMPLE_SELECTOR_RE = re.compile(r'[a-z][a-z0-9]*|(?:[a-z][a-z0-9]*)?(?:[#.][\w-]+|\[[\w-]+=["\']?[^"\'\]]+["\']?\])+')
+_SELECTOR_NAME_RE = re.compile(r'[#.]([\w-]+)|=\s*["\']?([^"\'\]]+)')
+_TAG_NAME_RE = re.compile(r"<([a-zA-Z][\w-]*)")
+
+
+def _selector_name(selector: str) -> str:
+    """
+    Selector'ın ham HTML'de aranacak adı; sadece etiketse "<etiket".
+    Sınırı çizilemeyen selector'larda (sözde sınıf, birleştirici...) None.
+    """
+    parts = selector.split()
+    last = parts[-1] if parts else ""
+    if not _SIMPLE_SELECTOR_RE.fullmatch(last):
+        return None
+    names = [a or b for a, b in _SELECTOR_NAME_RE.findall(last)]
+    return names[-1] if names else f"<{last}"
+
+
+def _element_end(html: str, tag_start: int):
+    """tag_start'taki elemanın kapanış etiketinin sonu; sınırlanamazsa None."""
+    match = _TAG_NAME_RE.match(html, tag_start)
+    open_end = html.find(">", tag_start)
+    if not match or open_end < 0:
+        return None
+    tag = match.group(1).lower()
+    if tag in VOID_TAGS or html[open_end - 1] == "/":
+        return open_end + 1
+    depth = 1
+    limit = tag_start + MAX_REGION_BYTES
+    for other in re.compile(rf"<(/?){tag}\b[^>]*>", re.I).finditer(html, open_end + 1, limit):
+        depth += -1 if other.group(1) else 1
+        if depth == 0:
+            return other.end()
+    # Kapanış pencerede yok (ör. kapanmayan <li>): değer pencere dışına taşabilir
+    return None
+
+
+def _state_script(html: str, name: str):
+    """`NAME = {...}` atamasından script sonuna kadarki metin; yoksa "", sınırsızsa None."""
+    match = re.search(r"(?:window\.)?" + re.escape(name) + r"\s*=", html)
+    if not match:
+        return ""
+    end = html.find("</script", match.end())
+    return html[match.start():end] if end >= 0 else None
+
+
+def region_hash(html: str, fields: list, state_vars=()) -> str:
+    """
+    Ağaç kurmadan, ham HTML'de alan değerlerinin çıkabileceği tüm
+    bölgelerin özeti: JSON-LD blokları, durum değişkeni script'leri ve her
+    alanın tüm yedek selector'larının eşleşebileceği elemanlar (açılış
+    etiketinden kapanışına kadar). Bir selector ya da eleman
+    sınırlanamazsa None döner ve sayfa her zamanki gibi çözülür.
+    """
+    digest = hashlib.sha1()
+    for block in LD_JSON_RE.findall(html):
+        digest.update(block.encode("utf-8"))
+    for name in state_vars:
+        script = _state_script(html, name)
+        if script is None:
+            return None
+        digest.update(f"{name}:{script}".encode("utf-8"))
+    for field in fields:
+        for selector in field["selectors"]:
+            name = _selector_name(selector)
+            if not name:
+                return None
+            starts = [match.start() for match in re.finditer(re.escape(name), html, re.I if name[0] == "<" else 0)]
+            if len(starts) > MAX_OCCURRENCES:
+                return None
+            # Eleman bu sayfada yoksa (ör. stok düğmesi) yokluğu da özete girer
+            digest.update(f"{name}:{len(starts)}".encode("utf-8"))
+            for start in starts:
+                tag_start = html.rfind("<", 0, start + 1)
+                if tag_start < 0 or html.rfind(">", 0, start) > tag_start:
+                    continue    # etiket dışında (metin/CSS içinde) geçiyor: selector eşleşmez
+                end = _element_end(html, tag_start)
+                if end is None:
+                    return None
+                digest.update(html[tag_start:end].encode("utf-8"))
+    return digest.hexdigest()
+
+
+def field_hash(raw: dict) -> str:
+    """Çıkarılan ham alan değerlerinin sıra bağımsız özeti."""
+    return hashlib.sha1(json.dumps(raw, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class PageValidators:
+    """URL -> (ETag, Last-Modified, alan özeti, son veri) deposu."""
+
+    def __init__(self, path: str = "sayfa_dogrulayicilar.db"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(pages)")}
+        if "region_hash" not in columns:
+            self.conn.execute("ALTER TABLE pages ADD COLUMN region_hash TEXT")
+            self.conn.commit()
+
+    def get(self, url: str) -> dict:
+        row = self.conn.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+        if not row:
+            return None
+        state = dict(row)
+        state["data"] = json.loads(state["data"]) if state["data"] else None
+        return state
+
+    def request_headers(self, state: dict) -> dict:
+        """Koşullu istek başlıkları; son veri yoksa 304'ün faydası olmaz."""
+        if not state or not state["data"]:
+            return {}
+        headers = {}
+        if state["etag"]:
+            headers["If-None-Match"] = state["etag"]
+        if state["last_modified"]:
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def update(self, url: str, etag: str, last_modified: str, digest: str, data: dict,
+               region: str = None):
+        self.conn.execute(
+            "INSERT INTO pages (url, etag, last_modified, field_hash, region_hash, data, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, "
+            "last_modified = excluded.last_modified, field_hash = excluded.field_hash, "
+            "region_hash = excluded.region_hash, data = excluded.data, updated_at = excluded.updated_at",
+            (url, etag, last_modified, digest, region, json.dumps(data, ensure_ascii=False),
+             datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
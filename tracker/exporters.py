@@ -0,0 +1,131 @@
+"""
+Price Tracker - Akışlı Dışa Aktarım
+===================================
+Sonuçları bellekte liste tutmadan, async iterator'dan satır satır yazar:
+- xlsx: openpyxl write-only modu (satırlar doğrudan diske akar)
+- csv:  standart csv modülü
+- parquet: pyarrow ile BATCH_SIZE satırlık parçalar halinde
+
+Benchmark: benchmarks/export_speed.py
+"""
+
+import csv
+from pathlib import Path
+
+
+# (sonuç anahtarı, Excel başlığı, sütun genişliği)
+COLUMNS = [
+    ("name", "Ürün Adı", 20),
+    ("title", "Site Başlığı", 50),
+    ("price", "Fiyat (Metin)", 15),
+    ("price_numeric", "Fiyat (Sayı)", 12),
+    ("currency", "Para Birimi", 10),
+    ("availability", "Stok/Durum", 25),
+    ("url", "Link", 60),
+    ("timestamp", "Zaman", 20),
+    ("status", "Durum", 30),
+    ("anomaly", "Anomali", 30),
+]
+
+BATCH_SIZE = 10_000
+FORMATS = ("xlsx", "csv", "parquet")
+
+
+async def aiter_rows(rows):
+    """Senkron bir iterable'ı (ör. veritabanı imleci) async iterator'a çevirir."""
+    for row in rows:
+        yield row
+
+
+async def write_excel_stream(rows, filename: str) -> int:
+    """write-only Workbook ile satırları akışlı yazar, yazılan satır sayısını döndürür."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Fiyatlar")
+
+    # write-only modda genişlikler satırlardan önce ayarlanmalı
+    for i, (_, _, width) in enumerate(COLUMNS, 1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="2C3E50", end_color="2C3E50", fill_type="solid")
+    header = []
+    for _, title, _ in COLUMNS:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center")
+        header.append(cell)
+    ws.append(header)
+
+    # Anomali işaretli satırlar renklendirilir
+    anomaly_fill = PatternFill(start_color="F9D6D5", end_color="F9D6D5", fill_type="solid")
+    count = 0
+    async for row in rows:
+        values = [row.get(key) for key, _, _ in COLUMNS]
+        if row.get("anomaly"):
+            values = [WriteOnlyCell(ws, value=value) for value in values]
+            for cell in values:
+                cell.fill = anomaly_fill
+        ws.append(values)
+        count += 1
+
+    wb.save(filename)
+    return count
+
+
+async def write_csv_stream(rows, filename: str) -> int:
+    count = 0
+    # utf-8-sig: Excel Türkçe karakterleri doğru açsın
+    with open(filename, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow([key for key, _, _ in COLUMNS])
+        async for row in rows:
+            writer.writerow([row.get(key) for key, _, _ in COLUMNS])
+            count += 1
+    return count
+
+
+async def write_parquet_stream(rows, filename: str, batch_size: int = BATCH_SIZE) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (key, pa.float64() if key == "price_numeric" else pa.string())
+        for key, _, _ in COLUMNS
+    ])
+    count = 0
+    batch = {key: [] for key, _, _ in COLUMNS}
+    with pq.ParquetWriter(filename, schema, compression="zstd") as writer:
+        async for row in rows:
+            for key in batch:
+                batch[key].append(row.get(key))
+            count += 1
+            if count % batch_size == 0:
+                writer.write_table(pa.table(batch, schema=schema))
+                batch = {key: [] for key in batch}
+        if batch["url"]:
+            writer.write_table(pa.table(batch, schema=schema))
+    return count
+
+
+def export_format(filename: str, fmt: str = None) -> str:
+    """Formatı (verilmezse dosya uzantısından) döndürür; desteklenmiyorsa ValueError."""
+    fmt = fmt or Path(filename).suffix.lstrip(".")
+    if fmt not in FORMATS:
+        raise ValueError(f"Desteklenmeyen format: {fmt or '?'} ({', '.join(FORMATS)})")
+    return fmt
+
+
+async def export_rows(rows, filename: str, fmt: str = None) -> int:
+    """Formatı (verilmezse dosya uzantısından) seçip akışlı yazar."""
+    fmt = export_format(filename, fmt)
+    writers = {"xlsx": write_excel_stream, "csv": write_csv_stream, "parquet": write_parquet_stream}
+    print(f"\n[EXPORT] Kaydediliyor: {filename}")
+    count = await writers[fmt](rows, filename)
+    print(f"[OK] {count} satır yazıldı.")
+    return count
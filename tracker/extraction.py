@@ -0,0 +1,105 @@
+"""
+Price Tracker - Deklaratif Alan Çıkarma
+=======================================
+Scraper'lar alanlarını ve yedek selector'larını bir kez tanımlar;
+tüm alanlar tek bir page.evaluate çağrısında (tek CDP round-trip)
+çözülür ve sözlük olarak döner.
+
+Alan tanımı biçimleri:
+    "title": ["h1.product-name", ".product-name-text"]      # metin
+    "in_cart": {"selectors": [".add-to-basket"], "exists": True}  # var/yok
+"""
+
+# Sayfa içinde çalışır: hazır işareti (waitFor) görünene kadar en fazla
+# timeout ms bekler, sonra tüm alanları sırayla çözer. Hiçbir selector'ı
+# değer vermeyen alan sayısı (missed) hızlı geçilen timeout'ları raporlamak
+# içindir; değeri bulunan alanın denenip bulunamayan yedekleri sayılmaz.
+EXTRACT_JS = """
+async ({fields, waitFor, timeout}) => {
+    const find = (selector) => {
+        try { return document.querySelector(selector); } catch (e) { return null; }
+    };
+    const deadline = Date.now() + timeout;
+    while (waitFor.length && !waitFor.some(find) && Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, 100));
+    }
+    const ready = !waitFor.length || waitFor.some(find);
+    const out = {};
+    let missed = 0;
+    for (const field of fields) {
+        let value = field.exists ? false : null;
+        for (const selector of field.selectors) {
+            const el = find(selector);
+            if (!el) continue;
+            if (field.exists) { value = true; break; }
+            const text = el.innerText;
+            if (text) { value = text; break; }
+        }
+        if (value === null) missed++;
+        out[field.name] = value;
+    }
+    return {values: out, missed, ready};
+}
+"""
+
+
+def normalize_fields(fields: dict) -> list:
+    """Alan tanımlarını evaluate'e gönderilecek tek tip listeye çevirir."""
+    normalized = []
+    for name, spec in fields.items():
+        if isinstance(spec, str):
+            spec = {"selectors": [spec]}
+        elif isinstance(spec, (list, tuple)):
+            spec = {"selectors": list(spec)}
+        normalized.append({
+            "name": name,
+            "selectors": list(spec["selectors"]),
+            "exists": bool(spec.get("exists", False)),
+        })
+    return normalized
+
+
+async def extract_fields(page, fields: list, wait_for: list = None, timeout: int = 3000) -> dict:
+    """
+    Normalize edilmiş alanları tek bir evaluate çağrısıyla çözer.
+
+    {"values": {...}, "missed": int, "ready": bool} döndürür.
+    """
+    if wait_for is None:
+        wait_for = fields[0]["selectors"] if fields else []
+    return await page.evaluate(EXTRACT_JS, {
+        "fields": fields,
+        "waitFor": list(wait_for),
+        "timeout": timeout,
+    })
+
+
+def extract_from_html(html: str, fields: list) -> dict:
+    """
+    Aynı alan tanımlarını tarayıcısız, statik HTML üzerinde çözer.
+
+    lxml + cssselect kullanır; metinler innerText'e yakın olacak
+    şekilde boşlukları sadeleştirilmiş olarak döner.
+    """
+    from lxml import html as lxml_html
+
+    tree = lxml_html.fromstring(html)
+    out = {}
+    for field in fields:
+        value = False if field["exists"] else None
+        for selector in field["selectors"]:
+            try:
+                matches = tree.cssselect(selector)
+            except Exception:
+                matches = []
+            if not matches:
+                continue
+            if field["exists"]:
+                value = True
+                break
+            text = " ".join(matches[0].text_content().split())
+            if text:
+                value = text
+                break
+        out[field["name"]] = value
+    return out
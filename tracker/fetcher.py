@@ -0,0 +1,159 @@
+"""
+Price Tracker - Kademeli Fetcher
+================================
+Önce keep-alive HTTP oturumu + statik HTML ayrıştırıcı ile dener;
+zorunlu alanlar boş kalırsa Playwright'a (tarayıcı) düşülür.
+Hangi kademenin başarılı olduğu domain bazında tutulur; HTTP ile
+hiç sonuç alınamayan domainlerde HTTP denemesi atlanır.
+
+Doğrulayıcı deposu verilirse istekler koşullu gönderilir; 304 ya da
+aynı bölge özeti (ham HTML, ayrıştırmadan önce) durumunda son veri
+"unchanged" işaretiyle döner. Bölge değişip alanlar aynı kaldıysa da
+(alan özeti) "unchanged" döner, ama sayfa o durumda çözülmüş olur.
+"""
+
+import asyncio
+from collections import defaultdict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracker.conditional import field_hash, region_hash
+from tracker.extraction import extract_from_html
+from tracker.ratelimit import THROTTLE_STATUSES, BlockedError, is_block_url
+
+
+# Bu kadar HTTP denemesinin hiçbiri başarılı olmazsa domain "sadece tarayıcı" sayılır
+HTTP_GIVE_UP_AFTER = 3
+
+
+class HttpClient:
+    """Bağlantı havuzlu, keep-alive requests oturumu."""
+
+    def __init__(self, user_agent: str, pool_size: int = 16, timeout: float = 15):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "tr-TR,tr;q=0.9,en;q=0.8",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, headers: dict = None) -> requests.Response:
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class TieredFetcher:
+    """HTTP-önce, tarayıcı-yedek getirme stratejisi ve domain istatistikleri."""
+
+    def __init__(self, client: HttpClient, validators=None, structured=None):
+        self.client = client
+        self.validators = validators
+        self.structured = structured
+        self.domains = defaultdict(lambda: {"http": 0, "http_miss": 0, "browser": 0})
+        self.not_modified = 0
+        self.same_region = 0
+        self.same_hash = 0
+
+    def should_try_http(self, domain: str) -> bool:
+        """Domain için HTTP kademesi hâlâ denenmeye değer mi?"""
+        stats = self.domains[domain]
+        return not (stats["http"] == 0 and stats["http_miss"] >= HTTP_GIVE_UP_AFTER)
+
+    async def fetch_http(self, url: str, domain: str, scraper, on_html=None) -> dict:
+        """
+        HTTP kademesini dener. Zorunlu alanlar doluysa scraper.parse
+        çıktısını, değilse None döndürür (tarayıcıya düşülmeli).
+        Site isteği kısıtladıysa BlockedError fırlatır; tarayıcıyla
+        tekrar denemek aynı engele takılacağı için düşülmez.
+        on_html verilirse başarılı sayfanın HTML'i ile çağrılır.
+        """
+        if not self.should_try_http(domain):
+            return None
+        state = self.validators.get(url) if self.validators else None
+        headers = self.validators.request_headers(state) if self.validators else None
+        try:
+            response = await asyncio.to_thread(self.client.get, url, headers or None)
+        except Exception as e:
+            print(f"[HTTP] {domain} -> tarayıcıya geçiliyor ({str(e)[:40]})")
+            self.domains[domain]["http_miss"] += 1
+            return None
+        if response.status_code in THROTTLE_STATUSES or is_block_url(response.url):
+            raise BlockedError(f"HTTP {response.status_code} ({domain})")
+        if response.status_code == 304 and headers:
+            self.domains[domain]["http"] += 1
+            self.not_modified += 1
+            return dict(state["data"], unchanged=True)
+
+        try:
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            html = response.text
+            structured = getattr(scraper.spec, "structured", None) or {}
+            region = (region_hash(html, scraper._fields, structured.get("state_vars", ()))
+                      if self.validators else None)
+            if region and state and state["data"] and state["region_hash"] == region:
+                # Alan bölgeleri aynı: ağaç kurmadan ve selector çalıştırmadan geç
+                self.domains[domain]["http"] += 1
+                self.same_region += 1
+                if on_html:
+                    await on_html(html)
+                self.validators.update(url, response.headers.get("ETag"),
+                                       response.headers.get("Last-Modified"), state["field_hash"],
+                                       state["data"], region)
+                return dict(state["data"], unchanged=True)
+            # Yapısal veri bulunursa selector'larla çözmeye gerek kalmaz
+            data = self.structured.from_html(domain, html, scraper.spec) if self.structured else None
+            raw = data or await asyncio.to_thread(extract_from_html, html, scraper._fields)
+        except Exception as e:
+            print(f"[HTTP] {domain} -> tarayıcıya geçiliyor ({str(e)[:40]})")
+            self.domains[domain]["http_miss"] += 1
+            return None
+
+        if data is None and not scraper.has_required(raw):
+            self.domains[domain]["http_miss"] += 1
+            return None
+        self.domains[domain]["http"] += 1
+        if on_html:
+            await on_html(html)
+        if self.validators:
+            digest = field_hash(raw)
+            if state and state["data"] and state["field_hash"] == digest:
+                self.same_hash += 1
+                data = dict(state["data"], unchanged=True)
+            else:
+                data = data or scraper.parse(raw)
+            # Doğrulayıcılar 304 dışındaki her başarılı yanıtta yenilenir
+            self.validators.update(url, response.headers.get("ETag"),
+                                   response.headers.get("Last-Modified"), digest,
+                                   {k: v for k, v in data.items() if k != "unchanged"}, region)
+            return data
+        return data or scraper.parse(raw)
+
+    def record_browser(self, domain: str):
+        self.domains[domain]["browser"] += 1
+
+    def summary_lines(self) -> list:
+        lines = []
+        for domain, stats in sorted(self.domains.items()):
+            skipped = "" if self.should_try_http(domain) else " (HTTP atlanıyor)"
+            lines.append(
+                f"Kademe {domain}: HTTP {stats['http']} | HTTP boş {stats['http_miss']} | "
+                f"Tarayıcı {stats['browser']}{skipped}"
+            )
+        if self.not_modified or self.same_region or self.same_hash:
+            lines.append(f"Koşullu istek: {self.not_modified} adet 304 | "
+                         f"{self.same_region} adet aynı bölge (ayrıştırılmadı) | "
+                         f"{self.same_hash} adet aynı alan özeti")
+        return lines
+
+    def close(self):
+        self.client.close()
+        if self.validators:
+            self.validators.close()
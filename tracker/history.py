@@ -0,0 +1,301 @@
+"""
+Price Tracker - Fiyat Geçmişi Deposu
+====================================
+process_product sonuçlarını tamamlandıkça SQLite'a (WAL modu) ekler.
+Kayıtlar sadece eklenir; tek istisna arşivden yeniden çıkarma ile
+yapılan onarımdır (repair). (url, zaman) üzerindeki indeks
+"son fiyat", "T anındaki fiyat" ve "aralıktaki min/max" sorgularını
+hızlı tutar. Excel çıktısı bu deponun bir görünümüdür.
+
+Her gözlem bir çalıştırmaya (runs) bağlanır. Bitmeden kesilen bir
+çalıştırma --resume ile sürdürülür; o çalıştırmada başarıyla
+tamamlanmış URL'ler tekrar çekilmez.
+
+Sonuçta "source" anahtarı varsa (ör. kuyruk işinin kira belirteci) aynı
+anahtarlı gözlem ikinci kez eklenmez; kuyruk sonuçları tekrar tekrar
+toplanabilir.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    url           TEXT NOT NULL,
+    observed_at   TEXT NOT NULL,
+    name          TEXT,
+    title         TEXT,
+    price         TEXT,
+    price_numeric REAL,
+    availability  TEXT,
+    status        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_observations_url_time ON observations (url, observed_at);
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT,
+    label       TEXT
+);
+"""
+
+COLUMNS = ["name", "title", "price", "price_numeric", "currency", "availability", "url", "timestamp",
+           "status", "anomaly", "group"]
+
+
+def _row_to_result(row) -> dict:
+    return {
+        "name": row["name"],
+        "title": row["title"],
+        "price": row["price"],
+        "price_numeric": row["price_numeric"],
+        "currency": row["currency"],
+        "availability": row["availability"],
+        "url": row["url"],
+        "timestamp": row["observed_at"],
+        "status": row["status"],
+        "anomaly": row["anomaly"] or "",
+        "group": row["product_group"],
+    }
+
+
+class PriceHistory:
+    """Ekleme-odaklı fiyat gözlem deposu."""
+
+    def __init__(self, path: str = "fiyat_gecmisi.db"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.run_id = None
+
+    def _migrate(self):
+        """Eski veritabanlarına çalıştırma sütununu ekler."""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(observations)")}
+        if "run_id" not in columns:
+            self.conn.execute("ALTER TABLE observations ADD COLUMN run_id INTEGER")
+        if "anomaly" not in columns:
+            self.conn.execute("ALTER TABLE observations ADD COLUMN anomaly TEXT")
+        if "source" not in columns:
+            self.conn.execute("ALTER TABLE observations ADD COLUMN source TEXT")
+        if "currency" not in columns:
+            self.conn.execute("ALTER TABLE observations ADD COLUMN currency TEXT")
+        if "product_group" not in columns:
+            # İzleme listesindeki "group" (GROUP SQL'de ayrılmış kelime)
+            self.conn.execute("ALTER TABLE observations ADD COLUMN product_group TEXT")
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_observations_source ON observations (source) "
+            "WHERE source IS NOT NULL")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_observations_run ON observations (run_id, url)")
+        self.conn.commit()
+
+    def start_run(self, label: str = None) -> int:
+        """Yeni bir çalıştırma açar; sonraki gözlemler ona bağlanır."""
+        cursor = self.conn.execute(
+            "INSERT INTO runs (started_at, label) VALUES (?, ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), label),
+        )
+        self.conn.commit()
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def resume_run(self, label: str = None) -> int:
+        """
+        Etiketin son çalıştırması bitmeden kesildiyse onu sürdürür; son
+        çalıştırma bitmişse (ya da hiç yoksa) yenisini açar. Daha eski,
+        kesik kalmış çalıştırmalar sürdürülmez.
+        """
+        row = self.conn.execute(
+            "SELECT id, finished_at FROM runs WHERE label IS ? ORDER BY id DESC LIMIT 1",
+            (label,),
+        ).fetchone()
+        if row is None or row["finished_at"] is not None:
+            return self.start_run(label)
+        self.run_id = row["id"]
+        return self.run_id
+
+    def finish_run(self):
+        if self.run_id is None:
+            return
+        self.conn.execute(
+            "UPDATE runs SET finished_at = ? WHERE id = ?",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.run_id),
+        )
+        self.conn.commit()
+
+    def completed_urls(self, run_id: int = None) -> set:
+        """Çalıştırmada başarıyla tamamlanmış URL'ler (hatalılar tekrar denenir)."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT url FROM observations WHERE run_id = ? AND status LIKE '[OK]%'",
+            (run_id if run_id is not None else self.run_id,),
+        )
+        return {row["url"] for row in rows}
+
+    def add(self, result: dict) -> bool:
+        """
+        Bir process_product sonucunu hemen diske yazar (günlük kaydı).
+        WAL + commit sayesinde süreç çökse bile yazılmış sonuçlar kalır.
+        Aynı "source" anahtarlı gözlem zaten varsa eklemez ve False döner.
+        """
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO observations (url, observed_at, name, title, price, price_numeric, "
+            "availability, status, run_id, anomaly, source, product_group, currency) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (result["url"], result["timestamp"], result["name"], result["title"], result["price"],
+             result["price_numeric"], result["availability"], result["status"], self.run_id,
+             result.get("anomaly") or None, result.get("source"), result.get("group"),
+             result.get("currency")),
+        )
+        self.conn.commit()
+        return cursor.rowcount == 1
+
+    def repair(self, result: dict) -> bool:
+        """
+        Aynı (url, zaman) gözlemini yeniden çıkarılmış değerlerle günceller;
+        gözlem yoksa ekler. Güncelleme olduysa True döner.
+        """
+        cursor = self.conn.execute(
+            "UPDATE observations SET title = ?, price = ?, price_numeric = ?, currency = ?, "
+            "availability = ?, status = ? WHERE url = ? AND observed_at = ?",
+            (result["title"], result["price"], result["price_numeric"], result.get("currency"),
+             result["availability"], result["status"], result["url"], result["timestamp"]),
+        )
+        if cursor.rowcount == 0:
+            self.add(result)
+            return False
+        self.conn.commit()
+        return True
+
+    def renormalize(self, batch_size: int = 100_000) -> tuple:
+        """
+        Saklı fiyat metinlerini güncel normalleştiriciyle (tracker/prices.py)
+        toplu olarak yeniden çözer; sayı ile birlikte para birimi de yazılır.
+        Çözülemeyenler NULL olur (ortalamalara girmez). (güncellenen,
+        geçersiz) sayılarını döndürür.
+        """
+        from tracker.prices import normalize_prices
+
+        updated = invalid = 0
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT id, price, price_numeric, currency FROM observations WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            values, valid, currencies = normalize_prices([row["price"] for row in rows])
+            changes = []
+            for row, value, ok, currency in zip(rows, values.tolist(), valid.tolist(), currencies.tolist()):
+                new = value if ok else None
+                currency = currency or None
+                invalid += not ok
+                if new != row["price_numeric"] or currency != row["currency"]:
+                    changes.append((new, currency, row["id"]))
+            self.conn.executemany("UPDATE observations SET price_numeric = ?, currency = ? WHERE id = ?",
+                                  changes)
+            self.conn.commit()
+            updated += len(changes)
+        return updated, invalid
+
+    def recent_prices(self, per_url: int):
+        """
+        Her URL'nin son `per_url` geçerli ve anomali olmayan fiyatı,
+        (url, fiyat) olarak URL içinde eskiden yeniye - dedektör ısınması için.
+        """
+        rows = self.conn.execute(
+            "SELECT url, price_numeric FROM ("
+            "  SELECT url, price_numeric, id, ROW_NUMBER() OVER (PARTITION BY url ORDER BY id DESC) AS rn"
+            "  FROM observations WHERE price_numeric > 0 AND anomaly IS NULL AND status LIKE '[OK]%'"
+            ") WHERE rn <= ? ORDER BY url, id",
+            (per_url,),
+        )
+        for row in rows:
+            yield row["url"], row["price_numeric"]
+
+    def latest(self, url: str) -> dict:
+        """URL için en son gözlem (yoksa None)."""
+        row = self.conn.execute(
+            "SELECT * FROM observations WHERE url = ? ORDER BY observed_at DESC, id DESC LIMIT 1",
+            (url,),
+        ).fetchone()
+        return _row_to_result(row) if row else None
+
+    def price_at(self, url: str, when: str) -> dict:
+        """`when` anında geçerli olan (o ana kadarki son) gözlem."""
+        row = self.conn.execute(
+            "SELECT * FROM observations WHERE url = ? AND observed_at <= ? "
+            "ORDER BY observed_at DESC, id DESC LIMIT 1",
+            (url, when),
+        ).fetchone()
+        return _row_to_result(row) if row else None
+
+    def min_max(self, url: str, start: str, end: str) -> tuple:
+        """[start, end] aralığındaki geçerli fiyatların (min, max) değeri."""
+        row = self.conn.execute(
+            "SELECT MIN(price_numeric), MAX(price_numeric) FROM observations "
+            "WHERE url = ? AND observed_at BETWEEN ? AND ? AND price_numeric > 0",
+            (url, start, end),
+        ).fetchone()
+        return row[0], row[1]
+
+    def history(self, url: str) -> list:
+        """URL'nin tüm gözlemleri, eskiden yeniye."""
+        rows = self.conn.execute(
+            "SELECT * FROM observations WHERE url = ? ORDER BY observed_at, id", (url,)
+        )
+        return [_row_to_result(row) for row in rows]
+
+    def iter_latest(self):
+        """Her URL için son gözlem, imleçten tek tek - akışlı dışa aktarım için."""
+        rows = self.conn.execute(
+            "SELECT o.* FROM observations o "
+            "JOIN (SELECT url, MAX(id) AS id FROM observations GROUP BY url) last ON o.id = last.id "
+            "ORDER BY o.name"
+        )
+        for row in rows:
+            yield _row_to_result(row)
+
+    def latest_all(self) -> list:
+        """Her URL için son gözlem - Excel görünümü için."""
+        return list(self.iter_latest())
+
+    def iter_since(self, since: str):
+        """`since` anından sonraki gözlemler, eskiden yeniye (alarm ısınması için)."""
+        rows = self.conn.execute(
+            "SELECT * FROM observations WHERE observed_at >= ? ORDER BY observed_at, id", (since,)
+        )
+        for row in rows:
+            yield _row_to_result(row)
+
+    def iter_latest_valid(self, before: str):
+        """
+        Her URL'nin `before` anından önceki son başarılı ve anomali olmayan
+        gözlemi, eskiden yeniye - alarm durumunun (son fiyat/stok) tohumu.
+        """
+        rows = self.conn.execute(
+            "SELECT o.* FROM observations o "
+            "JOIN (SELECT url, MAX(id) AS id FROM observations "
+            "      WHERE observed_at < ? AND status LIKE '[OK]%' AND anomaly IS NULL GROUP BY url) last "
+            "ON o.id = last.id ORDER BY o.observed_at, o.id",
+            (before,),
+        )
+        for row in rows:
+            yield _row_to_result(row)
+
+    def iter_all(self):
+        """Tüm gözlemler, eskiden yeniye - tam geçmiş dışa aktarımı için."""
+        for row in self.conn.execute("SELECT * FROM observations ORDER BY id"):
+            yield _row_to_result(row)
+
+    def close(self):
+        self.conn.close()
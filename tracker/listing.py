@@ -0,0 +1,69 @@
+"""
+Price Tracker - Liste Sayfası Tarama
+====================================
+Kategori / arama sayfaları tek yüklemede 20-50 ürünün fiyatını
+gösterir. Site tanımındaki "listing" bölümü ürün kartını, kart
+içindeki alanları ve sonraki sayfa bağlantısını tarif eder; tüm
+kartlar tek bir page.evaluate ile çözülür.
+
+    "listing": {
+        "card": "article.product_pod",
+        "link": "h3 a",
+        "next": "li.next a",
+        "fields": {
+            "title": {"selectors": ["h3 a"], "attr": "title"},
+            "price": ["p.price_color"],
+            "stock": ["p.availability"]
+        }
+    }
+"""
+
+# Sayfa içinde çalışır: her kart için alanları (metin ya da öznitelik),
+# ürün bağlantısını ve sonraki sayfanın mutlak adresini döndürür.
+LISTING_JS = """
+({card, link, next, fields}) => {
+    const pick = (root, selector) => {
+        try { return root.querySelector(selector); } catch (e) { return null; }
+    };
+    const cards = Array.from(document.querySelectorAll(card)).map(el => {
+        const out = {};
+        for (const field of fields) {
+            let value = null;
+            for (const selector of field.selectors) {
+                const found = pick(el, selector);
+                if (!found) continue;
+                value = field.attr ? found.getAttribute(field.attr) : found.innerText;
+                if (value) break;
+            }
+            out[field.name] = value;
+        }
+        const anchor = link ? pick(el, link) : null;
+        out.url = anchor ? anchor.href : null;
+        return out;
+    });
+    const nextLink = next ? pick(document, next) : null;
+    return {cards, next: nextLink ? nextLink.href : null};
+}
+"""
+
+
+def normalize_listing(listing: dict) -> dict:
+    """Spec'teki listing bölümünü evaluate'e gönderilecek biçime çevirir."""
+    fields = []
+    for name, spec in listing.get("fields", {}).items():
+        if isinstance(spec, str):
+            spec = {"selectors": [spec]}
+        elif isinstance(spec, (list, tuple)):
+            spec = {"selectors": list(spec)}
+        fields.append({"name": name, "selectors": list(spec["selectors"]), "attr": spec.get("attr")})
+    return {
+        "card": listing["card"],
+        "link": listing.get("link"),
+        "next": listing.get("next"),
+        "fields": fields,
+    }
+
+
+async def extract_cards(page, listing: dict) -> dict:
+    """{"cards": [{alan: değer, "url": ...}], "next": sonraki sayfa ya da None}"""
+    return await page.evaluate(LISTING_JS, listing)
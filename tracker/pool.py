@@ -0,0 +1,261 @@
+"""
+Price Tracker - Sayfa Havuzu
+============================
+Sınırlı sayıda browser context ve sayfa açar, işleri bir asyncio
+kuyruğu üzerinden bu sayfalara dağıtır.
+
+Uzun çalışmalarda Chromium sayfaları bellek sızdırır; bu yüzden:
+- Bir sayfa recycle_after gezinmeden (yüklenen belge) sonra kapatılıp
+  aynı context'te yenisi açılır. HTTP kademesinden dönen, sayfaya hiç
+  gitmeyen işler sayılmaz.
+- Bir context context_recycle_after gezinmeden sonra ya da tarayıcı
+  süreçlerinin toplam RSS'i memory_limit_mb'yi aşınca "boşaltılır":
+  sayfaları işleri bitince kapanır, sonra context yenisiyle değişir.
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+
+# Tarayıcı RSS örnekleme aralığı (sn)
+RSS_SAMPLE_EVERY = 30
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+def browser_rss_mb() -> float:
+    """
+    Bu sürecin altındaki Chromium süreçlerinin toplam RSS'i (MB).
+    Uzak tarayıcıda (connect) ya da psutil yoksa None döner.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    total, found = 0, False
+    for child in psutil.Process(os.getpid()).children(recursive=True):
+        try:
+            if any(name in child.name().lower() for name in BROWSER_PROCESS_NAMES):
+                total += child.memory_info().rss
+                found = True
+        except psutil.Error:
+            pass
+    return total / 1024 / 1024 if found else None
+
+
+class PagePool:
+    """Sabit boyutlu Page havuzu; sayfalar context'lere eşit dağıtılır."""
+
+    def __init__(self, browser, size: int = 4, contexts: int = 2, context_options=None,
+                 setup_context=None, teardown_context=None, recycle_after: int = None,
+                 context_recycle_after: int = None, memory_limit_mb: float = None, stats=None):
+        self.browser = browser
+        self.size = max(1, size)
+        self.context_count = max(1, min(contexts, self.size))
+        # Sözlük ya da her yeni context için çağrılan fonksiyon (güncel oturum durumu)
+        self.context_options = context_options or {}
+        # Yeni açılan her context için çağrılan async kanca (route kurulumu vb.)
+        self.setup_context = setup_context
+        # Context kapanmadan hemen önce çağrılır (oturum durumunu kaydetme vb.)
+        self.teardown_context = teardown_context
+        self.recycle_after = recycle_after
+        self.context_recycle_after = context_recycle_after
+        self.memory_limit_mb = memory_limit_mb
+        self.stats = stats
+        self.start_ms = None
+        self.contexts = []
+        self._idle = asyncio.Queue()
+        self._context_of = {}                   # page -> context
+        self._page_uses = defaultdict(int)      # page -> gezinme sayısı
+        self._context_uses = defaultdict(int)   # context -> gezinme sayısı
+        self._navigations = defaultdict(int)    # page -> bu ödünçteki gezinmeler
+        self._context_pages = defaultdict(int)  # context -> açık sayfa sayısı
+        self._context_size = {}                 # context -> başlangıçtaki sayfa sayısı
+        self._draining = set()
+        self._last_sample = time.monotonic()
+        self.rss_mb = None
+        self.rss_peak_mb = None
+
+    def _incr(self, key: str, amount: float = 1):
+        if self.stats is not None:
+            self.stats.incr(key, amount)
+
+    async def _new_context(self):
+        options = self.context_options() if callable(self.context_options) else self.context_options
+        context = await self.browser.new_context(**options)
+        if self.setup_context:
+            await self.setup_context(context)
+        self.contexts.append(context)
+        return context
+
+    async def _new_page(self, context):
+        page = await context.new_page()
+        # Her yüklenen belge bir gezinmedir (goto, yönlendirme, yeniden yükleme)
+        page.on("domcontentloaded", lambda _: self._navigated(page))
+        self._context_of[page] = context
+        self._context_pages[context] += 1
+        return page
+
+    def _navigated(self, page):
+        self._navigations[page] += 1
+
+    async def start(self):
+        """Context'leri ve sayfaları önceden açar."""
+        started = time.monotonic()
+        for _ in range(self.context_count):
+            await self._new_context()
+        for i in range(self.size):
+            context = self.contexts[i % self.context_count]
+            self._context_size[context] = self._context_size.get(context, 0) + 1
+            self._idle.put_nowait(await self._new_page(context))
+        self.start_ms = (time.monotonic() - started) * 1000
+        print(f"[POOL] {self.size} sayfa / {self.context_count} context hazır ({self.start_ms:.0f} ms)")
+        return self
+
+    async def acquire(self):
+        while True:
+            page = await self._idle.get()
+            context = self._context_of.get(page)
+            if context not in self._draining:
+                return page
+            # Boşaltılan context'in boştaki sayfası: kapat, sıradakini al
+            await self._retire(page)
+
+    def release(self, page):
+        self._idle.put_nowait(page)
+
+    @asynccontextmanager
+    async def page(self):
+        """Havuzdan bir sayfa ödünç alır, iş bitince geri bırakır (gerekirse yeniler)."""
+        page = await self.acquire()
+        try:
+            yield page
+        finally:
+            await self._return(page)
+
+    async def _return(self, page):
+        context = self._context_of[page]
+        navigations = self._navigations.pop(page, 0)
+        self._page_uses[page] += navigations
+        self._context_uses[context] += navigations
+        await self._sample_memory()
+
+        if (context not in self._draining and self.context_recycle_after
+                and self._context_uses[context] >= self.context_recycle_after):
+            self._drain(context, "context_recycles")
+        if context in self._draining:
+            await self._retire(page)
+        elif self.recycle_after and self._page_uses[page] >= self.recycle_after:
+            self._incr("page_recycles")
+            await self._retire(page, replace=True)
+        else:
+            self.release(page)
+
+    def _drain(self, context, reason: str):
+        self._draining.add(context)
+        self._incr(reason)
+
+    async def _retire(self, page, replace: bool = False):
+        """Sayfayı kapatır; replace ise aynı context'te yenisini havuza koyar."""
+        context = self._context_of.pop(page)
+        self._page_uses.pop(page, None)
+        self._navigations.pop(page, None)
+        self._context_pages[context] -= 1
+        try:
+            await page.close()
+        except Exception:
+            pass
+        if replace:
+            self.release(await self._new_page(context))
+        elif context in self._draining and self._context_pages[context] == 0:
+            await self._replace_context(context)
+
+    async def _replace_context(self, old):
+        """Boşalan context'i kapatır, yerine aynı sayıda sayfayla yenisini açar."""
+        # size context sayısına bölünmüyorsa ilk context'ler bir fazla sayfa taşır
+        pages = self._context_size.pop(old, 1)
+        self._draining.discard(old)
+        self.contexts.remove(old)
+        self._context_uses.pop(old, None)
+        self._context_pages.pop(old, None)
+        if self.teardown_context:
+            await self.teardown_context(old)
+        await old.close()
+        context = await self._new_context()
+        self._context_size[context] = pages
+        for _ in range(pages):
+            self.release(await self._new_page(context))
+        print(f"[POOL] Context yenilendi ({pages} sayfa)")
+
+    async def _sample_memory(self):
+        """Aralıklı olarak tarayıcı RSS'ini ölçer; sınır aşılırsa bir context boşaltır."""
+        if time.monotonic() - self._last_sample < RSS_SAMPLE_EVERY:
+            return
+        self._last_sample = time.monotonic()
+        rss = await asyncio.to_thread(browser_rss_mb)
+        if rss is None:
+            return
+        self.rss_mb = rss
+        self.rss_peak_mb = max(rss, self.rss_peak_mb or 0)
+        if self.memory_limit_mb and rss > self.memory_limit_mb:
+            candidates = [c for c in self.contexts if c not in self._draining]
+            if candidates:
+                # En çok iş görmüş context en çok sızdırmış olandır
+                oldest = max(candidates, key=lambda c: self._context_uses[c])
+                print(f"[POOL] Tarayıcı RSS {rss:.0f} MB > {self.memory_limit_mb} MB, context boşaltılıyor")
+                self._drain(oldest, "memory_recycles")
+
+    def summary_lines(self) -> list:
+        if self.rss_peak_mb is None:
+            return []
+        return [f"Tarayıcı RSS: son {self.rss_mb:.0f} MB | zirve {self.rss_peak_mb:.0f} MB"]
+
+    async def close(self):
+        for context in self.contexts:
+            if self.teardown_context:
+                await self.teardown_context(context)
+            await context.close()
+        self.contexts = []
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+async def run_in_order(items, handler, concurrency: int = 4, collect: bool = True) -> list:
+    """
+    items içindeki her öğe için handler'ı en fazla `concurrency` eşzamanlı
+    işle çalıştırır ve sonuçları giriş sırasıyla döndürür.
+
+    items sınırsız bir iterable olabilir; kuyruk sınırlı olduğu için
+    üretici, işçilerden en fazla birkaç adım öndedir. collect=False ise
+    sonuçlar tutulmaz (handler kendisi kaydediyorsa) ve None döner.
+    """
+    concurrency = max(1, concurrency)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    results = {}
+
+    async def producer():
+        for index, item in enumerate(items):
+            await queue.put((index, item))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def worker():
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            index, item = job
+            result = await handler(item)
+            if collect:
+                results[index] = result
+
+    await asyncio.gather(producer(), *(worker() for _ in range(concurrency)))
+    if not collect:
+        return None
+    return [results[i] for i in range(len(results))]
@@ -0,0 +1,226 @@
+"""
+Price Tracker - Toplu Fiyat Normalleştirme
+==========================================
+Fiyat metinlerini tek geçişte (NumPy) sayıya çevirir. Metinler kod
+noktası matrisine dönüştürülür ve sütun sütun taranır; her adım tüm
+metinler için birlikte çalışır (metin başına Python döngüsü yoktur).
+
+Kurallar:
+- Para birimi: ₺/TL/TRY, $/USD, €/EUR, £/GBP (bulunamazsa "").
+- Ayırıcı: iki tür birden varsa sondaki ondalıktır ("1.299,90", "1,299.90").
+  Tek tür birden fazla kez geçiyorsa binliktir ("1,299,000"); tek kez
+  geçip ardından 1-2 rakam geliyorsa ondalıktır ("12,50").
+- Tek ayırıcı + tam 3 rakam belirsizdir; para biriminin yerel ondalık
+  işareti (LOCALE_DECIMAL) karar verir: ayırıcı o işaretse 3 haneli
+  ondalıktır ve geçersizdir ("1,299 TL", "$1.299"), değilse binliktir
+  ("1.299 TL", "$1,299"). Para birimi yoksa binlik sayılır.
+- Rakamlar arasındaki boşluklar binlik sayılır ("1 299,90 €").
+- Geçersiz: rakam yok, sıfır, ondalık kısmı 2 haneden uzun, binlik
+  grupları 3 haneli değil ("1.2.3") ya da metinde ikinci bir sayı var
+  ("12 x 108,25 TL" gibi taksit metinleri).
+
+Geçersiz satırlar 0 yerine NaN döner ve maskede False olur; böylece
+ortalamalar bozulmaz.
+"""
+
+import numpy as np
+
+
+CURRENCIES = (
+    ("TRY", ("₺", "TL", "TRY")),
+    ("USD", ("$", "USD")),
+    ("EUR", ("€", "EUR")),
+    ("GBP", ("£", "GBP")),
+)
+
+# Para birimi -> yerel ondalık işareti (1 nokta, 2 virgül)
+LOCALE_DECIMAL = {"TRY": 2, "EUR": 2, "USD": 1, "GBP": 1}
+
+# Bu uzunluktan sonraki karakterler yok sayılır (bellek sınırı için)
+MAX_LENGTH = 48
+CHUNK_SIZE = 16_384
+MAX_FRACTION_DIGITS = 2
+MAX_INTEGER_DIGITS = 12
+
+_ZERO, _NINE = ord("0"), ord("9")
+_DOT, _COMMA = ord("."), ord(",")
+# Boşluk, bölünmez boşluk, dar bölünmez boşluk, ince boşluk
+_SPACES = (0x20, 0xA0, 0x202F, 0x2009)
+
+
+def _is_space(codes: np.ndarray) -> np.ndarray:
+    """Boşluk maskesi; dört değer için np.isin'den (sıralama + arama) çok daha hızlı."""
+    mask = codes == _SPACES[0]
+    for space in _SPACES[1:]:
+        mask |= codes == space
+    return mask
+
+
+def _symbol_tables():
+    """
+    Para birimi aramasının tabloları; değer, para biriminin önceliğidir
+    (CURRENCIES'te önce gelen büyük). Tek karakterli simgeler (₺, $...)
+    doğrudan karşılaştırılır; 2-3 harfli kodlar (TL, USD...) bitişik büyük
+    harflerin 5 bitlik kodlarının paketlenmiş değeriyle tablodan bulunur.
+    """
+    single = []
+    packed = {2: np.zeros(32 ** 2, dtype=np.uint8), 3: np.zeros(32 ** 3, dtype=np.uint8)}
+    for priority, (_, symbols) in zip(range(len(CURRENCIES), 0, -1), CURRENCIES):
+        for symbol in symbols:
+            if len(symbol) == 1:
+                single.append((ord(symbol), priority))
+                continue
+            key = 0
+            for char in symbol:
+                key = key * 32 + ord(char) - _LETTER_BASE
+            packed[len(symbol)][key] = priority
+    names = np.array([""] + [code for code, _ in reversed(CURRENCIES)], dtype="<U3")
+    return single, packed, names
+
+
+_LETTER_BASE = ord("A") - 1
+_SINGLE_SYMBOLS, _PACKED_SYMBOLS, _CURRENCY_NAMES = _symbol_tables()
+
+
+def _currencies(codes: np.ndarray) -> np.ndarray:
+    """İlk eşleşen para birimi kodu (kod noktası matrisi üzerinde vektörel)."""
+    upper = (codes >= ord("A")) & (codes <= ord("Z"))
+    letters = (codes - _LETTER_BASE).astype(np.int16) * upper
+    # Konum başına en yüksek öncelik; satırın en büyüğü kazanır
+    best = np.zeros(codes.shape, dtype=np.uint8)
+    for symbol, priority in _SINGLE_SYMBOLS:
+        np.maximum(best, (codes == symbol) * np.uint8(priority), out=best)
+    packed = letters
+    for span in (2, 3):
+        if packed.shape[1] < 2:
+            break
+        packed = packed[:, :-1] * 32 + letters[:, span - 1:]
+        window = best[:, :packed.shape[1]]
+        np.maximum(window, _PACKED_SYMBOLS[span][packed], out=window)
+    return _CURRENCY_NAMES[best.max(axis=1)]
+
+
+def _parse_chunk(codes: np.ndarray, decimal_marks: np.ndarray):
+    """
+    Kod noktası matrisini sütun sütun tarar; her adım tüm satırlar için
+    vektörel çalışır. Ayırıcılar ancak ardından rakam gelirse sayılır.
+    decimal_marks: satır başına yerel ondalık işareti (0 bilinmiyor).
+    """
+    n = codes.shape[0]
+    started = np.zeros(n, dtype=bool)      # ilk rakam görüldü
+    ended = np.zeros(n, dtype=bool)        # ilk sayı bloğu bitti
+    extra = np.zeros(n, dtype=bool)        # blok bittikten sonra rakam var
+    mantissa = np.zeros(n, dtype=np.int64)  # ayırıcılar atılmış tüm rakamlar
+    n_digits = np.zeros(n, dtype=np.int16)
+    since_sep = np.zeros(n, dtype=np.int16)  # son ayırıcıdan sonraki rakamlar
+    pending = np.zeros(n, dtype=np.int8)   # bekleyen ayırıcı türü (0 yok)
+    last_kind = np.zeros(n, dtype=np.int8)
+    shifted = np.zeros(n, dtype=np.int64)
+    lead = np.zeros(n, dtype=np.int16)     # ilk ayırıcıdan önceki rakamlar
+    irregular = np.zeros(n, dtype=bool)    # binlik grup düzeni bozuk ("1.2.3")
+
+    # Karakter sınıfları tüm matris için bir kerede; tarama sütun sütun
+    columns = np.ascontiguousarray(codes.T)
+    is_digit = (columns >= _ZERO) & (columns <= _NINE)
+    # 1 nokta, 2 virgül, 3 boşluk (rakamlar arasında her zaman binlik)
+    separators = ((columns == _DOT) * np.int8(1) + (columns == _COMMA) * np.int8(2)
+                  + _is_space(columns) * np.int8(3))
+    is_separator = separators > 0
+    breaks = ~is_digit & ~is_separator
+    digit_values = np.where(is_digit, columns, _ZERO).astype(np.int64) - _ZERO
+    # Sütun başına kesinleşen ayırıcı türü; türlere göre sayımlar döngüden sonra
+    kinds = np.zeros(columns.shape, dtype=np.int8)
+
+    for digit, separator, marked, stop, value, kind in zip(is_digit, separators, is_separator, breaks,
+                                                           digit_values, kinds):
+        extra |= digit & ended
+        active = ~ended
+        take = digit & active
+        started |= take
+        # Rakam, bekleyen ayırıcıyı kesinleştirir; binlik grupları 3 haneli olmalı
+        commit = take & (pending > 0)
+        irregular |= commit & (last_kind > 0) & (since_sep != 3)
+        np.copyto(lead, n_digits, where=commit & (last_kind == 0))
+        np.multiply(pending, commit, out=kind)
+        np.copyto(last_kind, pending, where=commit)
+        since_sep *= ~commit
+        pending *= ~take
+
+        np.multiply(mantissa, 10, out=shifted)
+        shifted += value
+        np.copyto(mantissa, shifted, where=take)
+        n_digits += take
+        since_sep += take
+
+        inside = started & active
+        np.copyto(pending, separator, where=inside & marked)
+        ended |= inside & stop
+
+    dot_count = (kinds == 1).sum(axis=0)
+    comma_count = (kinds == 2).sum(axis=0)
+    space_count = (kinds == 3).sum(axis=0)
+    both = (dot_count > 0) & (comma_count > 0)
+    single_count = dot_count + comma_count
+    # Tek ayırıcı + 3 rakam: yerel ondalık işaretiyse ondalık (ve 3 hane: geçersiz)
+    ambiguous = (single_count == 1) & (space_count == 0) & (since_sep == 3)
+    decimal = (both | ((single_count == 1) & (since_sep != 3))
+               | (ambiguous & (last_kind == decimal_marks)))
+    # Binlik ayırıcı varsa ilk grup en fazla 3, (ondalık yoksa) son grup tam 3 hanelidir
+    thousands = (space_count > 0) | both | (~decimal & (single_count > 0))
+    irregular |= thousands & (lead > 3)
+    irregular |= thousands & ~decimal & (since_sep != 3)
+    n_fraction = np.where(decimal, since_sep, 0)
+    values = mantissa / np.power(10.0, n_fraction)
+
+    valid = (
+        started
+        & ~extra
+        & ~irregular
+        & (n_fraction <= MAX_FRACTION_DIGITS)
+        & (n_digits - n_fraction <= MAX_INTEGER_DIGITS)
+        & (values > 0)
+    )
+    return np.where(valid, np.round(values, MAX_FRACTION_DIGITS), np.nan), valid
+
+
+def _code_matrix(texts: list) -> np.ndarray:
+    """Metinleri (n, genişlik) uint32 kod noktası matrisine çevirir."""
+    array = np.array(texts, dtype=str)
+    width = max(1, min(MAX_LENGTH, array.dtype.itemsize // 4))
+    return array.astype(f"<U{width}").view(np.uint32).reshape(len(texts), width)
+
+
+def normalize_prices(texts, chunk_size: int = CHUNK_SIZE):
+    """
+    Fiyat metinlerini toplu olarak çözer.
+
+    (değerler float64 [geçersizde NaN], geçerlilik maskesi, para birimi kodları)
+    üçlüsünü döndürür. None/boş metinler geçersizdir.
+    """
+    items = ["" if text is None else str(text) for text in texts]
+    values = np.full(len(items), np.nan)
+    valid = np.zeros(len(items), dtype=bool)
+    currencies = np.full(len(items), "", dtype="<U3")
+    for start in range(0, len(items), chunk_size):
+        codes = _code_matrix(items[start:start + chunk_size])
+        stop = start + len(codes)
+        found = _currencies(codes)
+        currencies[start:stop] = found
+        marks = np.zeros(len(found), dtype=np.int8)
+        for code, mark in LOCALE_DECIMAL.items():
+            marks[found == code] = mark
+        values[start:stop], valid[start:stop] = _parse_chunk(codes, marks)
+    return values, valid, currencies
+
+
+def price_currency(text: str) -> str:
+    """Tek metnin para birimi kodu; bulunamazsa None."""
+    if not text:
+        return None
+    return str(_currencies(_code_matrix([str(text)]))[0]) or None
+
+
+def parse_price(text: str) -> float:
+    """Tek metin için normalize_prices; geçersizse None."""
+    values, valid, _ = normalize_prices([text])
+    return float(values[0]) if valid[0] else None
@@ -0,0 +1,124 @@
+"""
+Price Tracker - Domain Bazlı Hız Sınırlama
+==========================================
+Her domain (urlparse(url).netloc) için bir token bucket ve AIMD
+(additive increase / multiplicative decrease) eşzamanlılık sınırı.
+
+- Zaman aşımı, HTTP 429/503 ya da engel sayfasında hız ve eşzamanlılık
+  yarıya iner.
+- Gecikme sağlıklı kaldıkça (öğrenilen ortalamanın LATENCY_FACTOR katı
+  altında) ikisi de yavaşça artar.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+
+THROTTLE_STATUSES = {429, 503}
+# Yönlendirilen URL'de bunlar varsa site bizi engellemiş demektir
+BLOCK_URL_MARKERS = ("captcha", "/errors/validate", "/sorry", "robot-check")
+
+INITIAL_RATE = 1.0     # istek/sn
+MIN_RATE = 0.1
+MAX_RATE = 5.0
+RATE_STEP = 0.1
+BURST = 2
+LATENCY_FACTOR = 2.0
+
+
+class BlockedError(Exception):
+    """Site isteği kısıtladı (429/503) ya da engel sayfası döndürdü."""
+
+
+def is_block_url(url: str) -> bool:
+    url = url.lower()
+    return any(marker in url for marker in BLOCK_URL_MARKERS)
+
+
+class TokenBucket:
+    """Saniyede `rate` jeton üreten, en fazla `capacity` biriktiren kova."""
+
+    def __init__(self, rate: float, capacity: float = BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class DomainState:
+    def __init__(self):
+        self.bucket = TokenBucket(INITIAL_RATE)
+        self.limit = 1.0
+        self.in_flight = 0
+        self.cond = asyncio.Condition()
+        self.latency = None
+        self.requests = 0
+        self.backoffs = 0
+
+
+class DomainLimiter:
+    """Token bucket + AIMD eşzamanlılık, domain başına."""
+
+    def __init__(self, max_concurrency: int = 2):
+        self.max_concurrency = max_concurrency
+        self.domains = defaultdict(DomainState)
+
+    @asynccontextmanager
+    async def slot(self, domain: str):
+        """Domain için eşzamanlılık yeri ve bir jeton bekler."""
+        state = self.domains[domain]
+        async with state.cond:
+            await state.cond.wait_for(lambda: state.in_flight < max(1, int(state.limit)))
+            state.in_flight += 1
+        try:
+            await state.bucket.acquire()
+            state.requests += 1
+            yield state
+        finally:
+            async with state.cond:
+                state.in_flight -= 1
+                state.cond.notify_all()
+
+    def report(self, domain: str, ok: bool, latency: float = None, throttled: bool = False):
+        """İsteğin sonucunu bildirir; sınırlar buna göre ayarlanır."""
+        state = self.domains[domain]
+        if throttled:
+            state.backoffs += 1
+            state.limit = max(1.0, state.limit / 2)
+            state.bucket.rate = max(MIN_RATE, state.bucket.rate / 2)
+            print(f"[LIMIT] {domain} geri çekiliyor -> {state.bucket.rate:.2f} istek/sn")
+            return
+        if not ok or latency is None:
+            return
+
+        healthy = state.latency is None or latency <= state.latency * LATENCY_FACTOR
+        state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+        if healthy:
+            state.limit = min(self.max_concurrency, state.limit + 1 / state.limit)
+            state.bucket.rate = min(MAX_RATE, state.bucket.rate + RATE_STEP)
+
+    def summary_lines(self) -> list:
+        lines = []
+        for domain, state in sorted(self.domains.items()):
+            latency = f"{state.latency:.1f} sn" if state.latency is not None else "-"
+            lines.append(
+                f"Limit {domain}: {state.bucket.rate:.2f} istek/sn | eşzamanlılık "
+                f"{state.limit:.1f}/{self.max_concurrency} | gecikme {latency} | "
+                f"istek {state.requests} | geri çekilme {state.backoffs}"
+            )
+        return lines
@@ -0,0 +1,129 @@
+"""
+Price Tracker - Scraper Kayıt Defteri
+=====================================
+Normalize edilmiş host adını scraper'a O(1) sözlük aramasıyla eşler.
+Tam eşleşme yoksa eski get_scraper'daki gibi spec'in "host_keywords"
+listesi host içinde aranır (amazon.de, amazon.co.uk ...); o da yoksa
+varsayılan site kullanılır.
+Site tanımları tracker/sites altındaki JSON (PyYAML kuruluysa YAML)
+dosyalarından başlangıçta bir kez derlenir ve önbellekte tutulur;
+yeni bir perakendeci eklemek için sadece bir dosya eklemek yeterlidir.
+
+Eklentiler "price_tracker.sites" entry point grubu ile şunlardan
+birini sağlayabilir: spec klasörü yolu, spec sözlüğü ya da HOSTS
+özniteliği olan bir BaseScraper alt sınıfı.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
+
+from tracker.scrapers import BaseScraper, SiteSpec, SpecScraper
+
+
+SITES_DIR = Path(__file__).parent / "sites"
+PLUGIN_GROUP = "price_tracker.sites"
+# Host eşleşmezse kullanılan site (eski get_scraper'daki else dalı)
+DEFAULT_SITE = "books_toscrape"
+
+
+def normalize_host(url_or_host: str) -> str:
+    """URL ya da host'u küçük harfli, portsuz, www./m. öneksiz hale getirir."""
+    host = urlparse(url_or_host).hostname if "//" in url_or_host else url_or_host
+    host = (host or "").lower().split(":")[0].rstrip(".")
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+
+class ScraperRegistry:
+    """host -> (scraper sınıfı, spec) eşlemesi."""
+
+    def __init__(self):
+        self._hosts = {}
+        self._keywords = []     # (anahtar kelime, giriş), kayıt sırasıyla
+        self._sites = {}
+        self.default = None
+
+    def register(self, spec: SiteSpec, scraper_class=SpecScraper):
+        self._sites[spec.name] = (scraper_class, spec)
+        for host in spec.hosts:
+            self._hosts[normalize_host(host)] = (scraper_class, spec)
+        for keyword in spec.host_keywords:
+            self._keywords.append((keyword.lower(), (scraper_class, spec)))
+
+    def register_class(self, scraper_class):
+        """Python'da tanımlı (FIELDS/HOSTS öznitelikli) bir scraper'ı kaydeder."""
+        self.register(SiteSpec.for_class(scraper_class), scraper_class)
+
+    def load_file(self, path: Path):
+        if path.suffix == ".json":
+            data = json.loads(path.read_text(encoding="utf-8"))
+        else:
+            import yaml
+            data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        self.register(SiteSpec(data, source=str(path)))
+
+    def load_dir(self, directory):
+        patterns = ["*.json"]
+        try:
+            import yaml  # noqa: F401
+            patterns += ["*.yaml", "*.yml"]
+        except ImportError:
+            pass
+        for pattern in patterns:
+            for path in sorted(Path(directory).glob(pattern)):
+                self.load_file(path)
+
+    def load_plugins(self, group: str = PLUGIN_GROUP):
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=group):
+            try:
+                plugin = entry_point.load()
+                if isinstance(plugin, (str, Path)):
+                    self.load_dir(plugin)
+                elif isinstance(plugin, dict):
+                    self.register(SiteSpec(plugin, source=entry_point.name))
+                elif isinstance(plugin, type) and issubclass(plugin, BaseScraper):
+                    self.register_class(plugin)
+                print(f"[REGISTRY] Eklenti yüklendi: {entry_point.name}")
+            except Exception as e:
+                print(f"[REGISTRY] Eklenti yüklenemedi: {entry_point.name} ({e})")
+
+    def site(self, name: str) -> tuple:
+        return self._sites[name]
+
+    def lookup(self, url: str) -> tuple:
+        """
+        URL için (scraper sınıfı, spec); alt alan adları üst domaine,
+        bilinmeyen host'lar anahtar kelime eşleşmesine düşer.
+        """
+        host = normalize_host(url)
+        entry = self._hosts.get(host)
+        parent = host
+        while entry is None and "." in parent:
+            parent = parent.split(".", 1)[1]
+            entry = self._hosts.get(parent)
+        if entry is None:
+            entry = next((found for keyword, found in self._keywords if keyword in host), None)
+        return entry or self.default
+
+    def create(self, url: str) -> BaseScraper:
+        scraper_class, spec = self.lookup(url)
+        return scraper_class(spec)
+
+    def __len__(self):
+        return len(self._sites)
+
+
+@lru_cache(maxsize=None)
+def default_registry() -> ScraperRegistry:
+    """Yerleşik site dosyaları + eklentiler; süreç başına bir kez derlenir."""
+    registry = ScraperRegistry()
+    registry.load_dir(SITES_DIR)
+    registry.load_plugins()
+    registry.default = registry.site(DEFAULT_SITE)
+    return registry
@@ -0,0 +1,97 @@
+"""
+Price Tracker - Yeniden Deneme ve Devre Kesici
+==============================================
+RetryPolicy: üstel geri çekilme + rastgele sapma ile yeniden deneme.
+CircuitBreaker: bir domain art arda N kez başarısız olursa devre açılır,
+o domainin kalan URL'leri beklemeden atlanır. Bekleme süresi (cooldown)
+dolunca tek bir deneme isteğine izin verilir (yarı açık); başarılıysa
+devre kapanır, değilse yeniden açılır.
+"""
+
+import random
+import time
+from collections import defaultdict
+
+
+class RetryPolicy:
+    """Deneme sayısı ve denemeler arası bekleme süresi."""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 2.0, max_delay: float = 30.0,
+                 jitter: float = 0.5):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """attempt. başarısız denemeden sonra beklenecek süre (sn)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+CLOSED, OPEN, HALF_OPEN = "kapalı", "açık", "yarı açık"
+
+
+class BreakerState:
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_running = False
+        self.skipped = 0
+        self.trips = 0
+
+
+class CircuitBreaker:
+    """Domain başına devre kesici."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 300):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.domains = defaultdict(BreakerState)
+
+    def allow(self, domain: str) -> bool:
+        """Domain'e istek atılabilir mi? Atlanacaksa sayacı artırır."""
+        state = self.domains[domain]
+        if state.state == OPEN and time.monotonic() - state.opened_at >= self.cooldown:
+            state.state = HALF_OPEN
+            state.trial_running = False
+        if state.state == CLOSED:
+            return True
+        if state.state == HALF_OPEN and not state.trial_running:
+            state.trial_running = True
+            print(f"[BREAKER] {domain} yarı açık, deneme isteği gönderiliyor")
+            return True
+        state.skipped += 1
+        return False
+
+    def is_open(self, domain: str) -> bool:
+        return self.domains[domain].state == OPEN
+
+    def record_success(self, domain: str):
+        state = self.domains[domain]
+        if state.state != CLOSED:
+            print(f"[BREAKER] {domain} devresi kapandı")
+        state.state = CLOSED
+        state.failures = 0
+        state.trial_running = False
+
+    def record_failure(self, domain: str):
+        state = self.domains[domain]
+        state.failures += 1
+        if state.state == HALF_OPEN or (state.state == CLOSED and state.failures >= self.threshold):
+            state.state = OPEN
+            state.opened_at = time.monotonic()
+            state.trial_running = False
+            state.trips += 1
+            print(f"[BREAKER] {domain} devresi açıldı ({state.failures} art arda hata), "
+                  f"{self.cooldown:.0f} sn atlanacak")
+
+    def summary_lines(self) -> list:
+        lines = []
+        for domain, state in sorted(self.domains.items()):
+            if state.trips or state.skipped:
+                lines.append(
+                    f"Devre {domain}: {state.state} | açılma {state.trips} | atlanan {state.skipped}"
+                )
+        return lines
@@ -0,0 +1,89 @@
+"""
+Price Tracker - Daemon Zamanlayıcısı
+====================================
+Her ürünün kendi yenileme aralığı vardır; sıradaki iş bir öncelik
+kuyruğundan (heapq) alınır. Fiyatı sık değişen ürünlerin aralığı
+kısalır (terfi), sabit kalanlarınki uzar (düşüş). Aynı anda aynı
+siteye gidilmemesi için zamana rastgele sapma (jitter) eklenir;
+domain başına eşzamanlılık sınırı tracker/ratelimit.py'dedir.
+"""
+
+import heapq
+import itertools
+import random
+import time
+
+
+DEFAULT_INTERVAL = 3600      # sn
+MIN_INTERVAL = 300
+MAX_INTERVAL = 24 * 3600
+JITTER = 0.1                 # aralığın ±%10'u
+PROMOTE_FACTOR = 0.5         # fiyat değiştiyse aralık çarpanı
+DEMOTE_FACTOR = 1.5          # değişmediyse aralık çarpanı
+
+
+class ScheduledProduct:
+    """Zamanlayıcıdaki bir ürün ve güncel yenileme aralığı."""
+
+    def __init__(self, product: dict, interval: float):
+        self.product = product
+        self.interval = interval
+        self.next_run = 0.0
+        self.runs = 0
+        self.changes = 0
+
+
+class Scheduler:
+    """next_run zamanına göre sıralı öncelik kuyruğu."""
+
+    def __init__(self, products, default_interval: float = DEFAULT_INTERVAL,
+                 min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL,
+                 jitter: float = JITTER):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self._heap = []
+        self._seq = itertools.count()
+        now = time.monotonic()
+        for product in products:
+            interval = float(product.get("interval") or default_interval)
+            item = ScheduledProduct(product, self._clamp(interval))
+            # İlk turu da yay, hepsi aynı anda başlamasın
+            item.next_run = now + random.uniform(0, self.jitter * item.interval)
+            self._push(item)
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _push(self, item: ScheduledProduct):
+        heapq.heappush(self._heap, (item.next_run, next(self._seq), item))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def next_due_in(self) -> float:
+        """Sıradaki işe kalan süre (sn); kuyruk boşsa MAX_INTERVAL."""
+        if not self._heap:
+            return self.max_interval
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def pop_due(self, limit: int = None) -> list:
+        """Zamanı gelmiş en fazla `limit` ürünü kuyruktan çıkarır."""
+        now = time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def reschedule(self, item: ScheduledProduct, changed: bool):
+        """Fiyat değiştiyse ürünü terfi ettirir, değişmediyse geri planda tutar."""
+        item.runs += 1
+        if changed:
+            item.changes += 1
+            item.interval = self._clamp(item.interval * PROMOTE_FACTOR)
+        else:
+            item.interval = self._clamp(item.interval * DEMOTE_FACTOR)
+        spread = item.interval * self.jitter
+        item.next_run = time.monotonic() + item.interval + random.uniform(-spread, spread)
+        self._push(item)
+
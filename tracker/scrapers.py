@@ -0,0 +1,194 @@
+"""
+Price Tracker - Scraper Sınıfları
+=================================
+BaseScraper: alan çıkarma, hazır bekleme ve fiyat temizleme.
+SpecScraper: tracker/sites/*.json gibi veri dosyalarındaki site
+tanımından (SiteSpec) çalışan genel scraper; yeni bir site için
+Python sınıfı yazmak gerekmez.
+"""
+
+from abc import ABC, abstractmethod
+
+from tracker.extraction import normalize_fields, extract_fields
+from tracker.listing import normalize_listing
+from tracker.prices import parse_price, price_currency
+
+
+# Selector bekleme süresi (ms). Sitenin hazır işareti göründükten sonra
+# olmayan selector'lar bu süreyi beklemeden None döner.
+SELECTOR_TIMEOUT = 3000
+READY_TIMEOUT = 10000
+
+
+class SiteSpec:
+    """Bir sitenin derlenmiş tanımı: alanlar, hazır işareti, çıktı kuralları."""
+
+    _class_cache = {}
+
+    def __init__(self, data: dict, source: str = None):
+        self.name = data["name"]
+        self.source = source
+        self.hosts = list(data.get("hosts", []))
+        # hosts'ta olmayan host'lar için alt dize eşleşmesi ("amazon" -> amazon.de)
+        self.host_keywords = list(data.get("host_keywords", []))
+        self.fields = normalize_fields(data.get("fields", {}))
+        if data.get("ready_selector"):
+            self.ready_selectors = [data["ready_selector"]]
+        else:
+            self.ready_selectors = self.fields[0]["selectors"] if self.fields else []
+        # Fiyat alanlarının selector'ları: sayfa hazır beklemesinin işareti
+        self.price_selectors = [selector for field in self.fields
+                                if field["name"].startswith("price") for selector in field["selectors"]]
+        # Her öğe bir alan adı ya da "bunlardan biri yeterli" listesidir
+        self.required = [[item] if isinstance(item, str) else list(item)
+                         for item in data.get("required", ["title", "price"])]
+        self.output = data.get("output", {})
+        # Yedek alan -> asıl alan: asıl alan doluysa yedeğe hiç bakılmaz
+        self.fallbacks = {rule["fallback"]: rule["join"][0] for rule in self.output.values()
+                          if rule.get("fallback") and rule.get("join")}
+        # JSON-LD / gömülü durum ayarları (bkz. tracker/structured.py); false: hiç deneme
+        self.structured = data.get("structured", {})
+        # Kategori sayfası kart tanımı (bkz. tracker/listing.py); yoksa None
+        self.listing = normalize_listing(data["listing"]) if data.get("listing") else None
+
+    @classmethod
+    def for_class(cls, scraper_class) -> "SiteSpec":
+        """Sınıf öznitelikleriyle (FIELDS, READY_SELECTOR...) tanımlı scraper'ın spec'i."""
+        if scraper_class not in cls._class_cache:
+            cls._class_cache[scraper_class] = cls({
+                "name": scraper_class.__name__,
+                "hosts": list(getattr(scraper_class, "HOSTS", [])),
+                "fields": scraper_class.FIELDS,
+                "ready_selector": scraper_class.READY_SELECTOR,
+                "required": list(scraper_class.REQUIRED_FIELDS),
+            }, source=scraper_class.__module__)
+        return cls._class_cache[scraper_class]
+
+
+class BaseScraper(ABC):
+    """Tüm scraper'lar için temel sınıf."""
+
+    # Spec verilmeden kullanılan (Python'da tanımlı) scraper'lar için:
+    # Alan adı -> sırayla denenecek selector'lar (bkz. tracker/extraction.py).
+    # Tanımlıysa scrape() tüm alanları tek bir page.evaluate ile çözer.
+    FIELDS = {}
+
+    # Sayfanın render edildiğini gösteren işaret selector'ı. Göründükten
+    # sonra eksik selector'lar timeout beklemeden None döner.
+    # None ise ilk alanın selector'ları kullanılır.
+    READY_SELECTOR = None
+
+    # HTTP kademesinde bu alanlar boşsa sayfa tarayıcıyla yeniden çekilir
+    REQUIRED_FIELDS = ("title", "price")
+
+    def __init__(self, spec: SiteSpec = None):
+        self.spec = spec or SiteSpec.for_class(type(self))
+        self._fields = self.spec.fields
+        self.ready_selectors = self.spec.ready_selectors
+        self.price_selectors = self.spec.price_selectors
+        self.ready = False
+        self.fast_fails = 0
+
+    async def scrape(self, page, timeout: int = READY_TIMEOUT) -> dict:
+        """Sayfadan veriyi çeker ve sözlük döndürür."""
+        data = await self.extract(page, timeout)
+        return self.parse(data)
+
+    async def extract(self, page, timeout: int = READY_TIMEOUT) -> dict:
+        """Tüm alanları tek round-trip'te çeker; hazır işaretini en fazla timeout ms bekler."""
+        result = await extract_fields(page, self._fields, wait_for=self.ready_selectors,
+                                      timeout=timeout)
+        values = result["values"]
+        self.ready = self.ready or result["ready"]
+        if result["ready"]:
+            # Asıl alanı dolu olan yedek alanı eski zincir hiç denemezdi
+            skipped = sum(1 for name, primary in self.spec.fallbacks.items()
+                          if values.get(name) is None and values.get(primary))
+            self.fast_fails += result["missed"] - skipped
+        return values
+
+    async def wait_until_ready(self, page) -> bool:
+        """Hazır işaretini bir kez bekler; sonraki çağrılar anında döner."""
+        if self.ready or not self.ready_selectors:
+            return self.ready
+        try:
+            await page.wait_for_selector(", ".join(self.ready_selectors), timeout=READY_TIMEOUT)
+            self.ready = True
+        except:
+            pass
+        return self.ready
+
+    def has_required(self, data: dict) -> bool:
+        """Ham alanlar sonucu kabul etmeye yetiyor mu?"""
+        return all(any(data.get(name) for name in group) for group in self.spec.required)
+
+    @abstractmethod
+    def parse(self, data: dict) -> dict:
+        """Ham alanlardan title/price/stock sözlüğünü üretir."""
+        pass
+
+    async def get_text(self, page, selector: str) -> str:
+        """Element metnini güvenli bir şekilde alır."""
+        # Sayfa hazırsa olmayan element için timeout beklemeye gerek yok
+        if await self.wait_until_ready(page):
+            element = await page.query_selector(selector)
+            if element is None:
+                self.fast_fails += 1
+                return None
+            return await element.inner_text()
+        try:
+            element = await page.wait_for_selector(selector, timeout=SELECTOR_TIMEOUT)
+            if element:
+                return await element.inner_text()
+        except:
+            pass
+        return None
+
+    def clean_price(self, price_text: str) -> float:
+        """
+        Fiyat metnini sayıya çevirir (bkz. tracker/prices.py).
+        Çözülemeyen metin için 0.0 yerine None döner; sıfırlar ortalamaları bozar.
+        """
+        return parse_price(price_text)
+
+    def price_currency(self, price_text: str) -> str:
+        """Fiyat metnindeki para birimi kodu (TRY, USD...); bulunamazsa None."""
+        return price_currency(price_text)
+
+
+class SpecScraper(BaseScraper):
+    """
+    Veri dosyasındaki "output" kurallarıyla çalışan genel scraper.
+
+    Kural biçimleri (title/price/stock için):
+        {"field": "title", "default": "Başlık Bulunamadı"}
+        {"join": ["price_whole", "price_fraction"], "sep": ",", "fallback": "price_alt"}
+        {"field": "add_to_cart", "if_true": "Stokta Var", "if_false": "Stok Yok"}
+        {"field": "stock", "strip_newlines": true}
+    """
+
+    def parse(self, data: dict) -> dict:
+        return {key: self._apply(self.spec.output.get(key, {"field": key}), data)
+                for key in ("title", "price", "stock")}
+
+    def _apply(self, rule: dict, data: dict):
+        if "if_true" in rule:
+            return rule["if_true"] if data.get(rule["field"]) else rule["if_false"]
+        if "join" in rule:
+            first, *rest = rule["join"]
+            text = data.get(first)
+            if text:
+                for name in rest:
+                    if data.get(name):
+                        text += rule.get("sep", "") + data[name]
+            elif rule.get("fallback"):
+                text = data.get(rule["fallback"])
+        else:
+            text = data.get(rule["field"])
+
+        if not text:
+            return rule.get("default", "N/A")
+        text = text.strip()
+        if rule.get("strip_newlines"):
+            text = text.replace("\n", "")
+        return text
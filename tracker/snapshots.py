@@ -0,0 +1,186 @@
+"""
+Price Tracker - Sayfa Arşivi
+============================
+process_product'ın gördüğü HTML'i zlib ile sıkıştırıp içerik adresli
+(sha256) olarak saklar; aynı sayfa iki kez yazılmaz. SQLite indeksi
+(url, zaman) -> özet eşlemesini tutar.
+
+Site işaretlemesi değiştiğinde selector'lar düzeltilip `--reextract`
+ile arşivdeki sayfalar ağa hiç çıkmadan, tüm çekirdeklerde paralel
+olarak yeniden çözülür ve geçmiş kayıtlar onarılır.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    url         TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    name        TEXT,
+    digest      TEXT NOT NULL,
+    size        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_url_time ON snapshots (url, captured_at);
+"""
+
+COMPRESS_LEVEL = 6
+REEXTRACT_CHUNK = 64
+
+
+def blob_path(directory: Path, digest: str) -> Path:
+    return directory / "objects" / digest[:2] / f"{digest}.html.z"
+
+
+def read_blob(directory: Path, digest: str) -> str:
+    return zlib.decompress(blob_path(directory, digest).read_bytes()).decode("utf-8")
+
+
+class SnapshotStore:
+    """İçerik adresli, sıkıştırılmış HTML arşivi ve (url, zaman) indeksi."""
+
+    def __init__(self, directory: str = "sayfa_arsivi"):
+        self.directory = Path(directory)
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.directory / "index.db", check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        # save() eşzamanlı olarak to_thread ile çağrılır
+        self._lock = threading.Lock()
+        self.saved = 0
+        self.deduped = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def save(self, url: str, html: str, captured_at: str, name: str = None) -> str:
+        """Sayfayı arşive ekler ve içerik özetini döndürür."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = blob_path(self.directory, digest)
+        packed = None if path.exists() else zlib.compress(data, COMPRESS_LEVEL)
+        with self._lock:
+            self.raw_bytes += len(data)
+            if packed is None:
+                self.deduped += 1
+            else:
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(packed)
+                os.replace(tmp, path)
+                self.stored_bytes += len(packed)
+            self.conn.execute(
+                "INSERT INTO snapshots (url, captured_at, name, digest, size) VALUES (?, ?, ?, ?, ?)",
+                (url, captured_at, name, digest, len(data)),
+            )
+            self.conn.commit()
+            self.saved += 1
+        return digest
+
+    def load(self, digest: str) -> str:
+        return read_blob(self.directory, digest)
+
+    def iter_index(self, url: str = None, since: str = None):
+        """(url, captured_at, name, digest) kayıtları, eskiden yeniye."""
+        query, params = "SELECT url, captured_at, name, digest FROM snapshots WHERE 1=1", []
+        if url:
+            query += " AND url = ?"
+            params.append(url)
+        if since:
+            query += " AND captured_at >= ?"
+            params.append(since)
+        for row in self.conn.execute(query + " ORDER BY captured_at, rowid", params):
+            yield tuple(row)
+
+    def summary_lines(self) -> list:
+        if not self.saved:
+            return []
+        return [
+            f"Sayfa arşivi: {self.saved} sayfa ({self.deduped} tekrar), "
+            f"{self.raw_bytes // 1000} KB -> {self.stored_bytes // 1000} KB yazıldı"
+        ]
+
+    def close(self):
+        self.conn.close()
+
+
+def reextract_one(directory: str, entry: tuple) -> dict:
+    """Tek arşiv kaydını güncel selector'larla çözer (işçi süreçte çalışır)."""
+    from tracker.extraction import extract_from_html
+    from tracker.registry import default_registry
+    from tracker.structured import StructuredExtractor
+
+    url, captured_at, name, digest = entry
+    result = {"name": name or url, "url": url, "timestamp": captured_at}
+    try:
+        scraper = default_registry().create(url)
+        html = read_blob(Path(directory), digest)
+        data = StructuredExtractor().from_html(url, html, scraper.spec)
+        if data is None:
+            raw = extract_from_html(html, scraper._fields)
+            if not scraper.has_required(raw):
+                raise ValueError("zorunlu alanlar boş")
+            data = scraper.parse(raw)
+        result.update({
+            "title": data["title"],
+            "price": data["price"],
+            "price_numeric": scraper.clean_price(data["price"]),
+            "currency": scraper.price_currency(data["price"]),
+            "availability": data["stock"],
+            "status": "[OK] Arşivden çıkarıldı",
+        })
+    except Exception as e:
+        result.update({
+            "title": "HATA",
+            "price": "N/A",
+            "price_numeric": None,
+            "currency": None,
+            "availability": "N/A",
+            "status": f"[ERROR] {str(e)[:50]}",
+        })
+    return result
+
+
+def _reextract_chunk(args) -> list:
+    directory, entries = args
+    return [reextract_one(directory, entry) for entry in entries]
+
+
+def _chunks(entries, size: int):
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def reextract(store: SnapshotStore, workers: int = None, url: str = None, since: str = None):
+    """
+    Arşivdeki sayfaları güncel scraper tanımlarıyla yeniden çözer.
+
+    Kayıtlar parçalar halinde işçi süreçlere dağıtılır; sonuçlar arşiv
+    sırasıyla, parça parça tamamlandıkça döner.
+    """
+    directory = str(store.directory)
+    workers = workers or os.cpu_count()
+    # İndeks satırları küçüktür; imleç uzun onarım boyunca açık kalmasın
+    # diye listeye alınır. İşçilere en fazla workers * 2 parça verilir.
+    entries = list(store.iter_index(url, since))
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in _chunks(entries, REEXTRACT_CHUNK):
+            pending.append(executor.submit(_reextract_chunk, (directory, chunk)))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
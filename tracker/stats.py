@@ -0,0 +1,88 @@
+"""
+Price Tracker - Çalıştırma İstatistikleri
+=========================================
+Bir çalıştırma boyunca sayaçları toplar ve sonunda özet basar.
+Bileşenler (limiter, fetcher vb.) kendi özet satırlarını
+add_reporter ile ekleyebilir.
+"""
+
+import time
+from collections import defaultdict
+
+
+# Süreç başına süre ölçümleri: toplanınca anlamsızlaşır, işçilerden aktarılmaz
+TIMING_KEYS = ("first_result_ms", "pool_start_ms", "browser_start_ms_cold", "browser_start_ms_warm")
+
+
+class RunStats:
+    """Çalıştırma başına sayaçlar ve özet raporu."""
+
+    def __init__(self):
+        self.counters = defaultdict(float)
+        self._reporters = []
+        self.started = time.monotonic()
+
+    def mark_first_result(self):
+        """Başlangıçtan ilk sonuca kadar geçen süreyi (bir kez) kaydeder."""
+        if not self.get("first_result_ms"):
+            self.counters["first_result_ms"] = (time.monotonic() - self.started) * 1000
+
+    def incr(self, key: str, amount: float = 1):
+        self.counters[key] += amount
+
+    def get(self, key: str, default: float = 0):
+        return self.counters.get(key, default)
+
+    def add_reporter(self, reporter):
+        """reporter() -> list[str] özet satırları döndüren bir fonksiyon."""
+        self._reporters.append(reporter)
+
+    def summary_lines(self) -> list:
+        lines = [
+            f"Ürün: {int(self.get('products'))} | "
+            f"Başarılı: {int(self.get('ok'))} | Hata: {int(self.get('error'))} | "
+            f"Atlanan: {int(self.get('skipped'))} | Tekrar deneme: {int(self.get('retries'))}"
+        ]
+        if self.get("price_invalid"):
+            lines.append(f"Sayıya çevrilemeyen fiyat: {int(self.get('price_invalid'))}")
+        if self.get("resumed"):
+            lines.append(f"Önceki çalıştırmadan devralınan (atlanan) URL: {int(self.get('resumed'))}")
+        if self.get("listing_pages"):
+            lines.append(
+                f"Liste taraması: {int(self.get('listing_pages'))} sayfa, "
+                f"{int(self.get('listing_cards'))} ürün "
+                f"(sayfa başına {self.get('listing_cards') / self.get('listing_pages'):.1f})"
+            )
+        if self.get("unchanged"):
+            lines.append(f"Değişmeyen (çözülmeden geçilen) sayfa: {int(self.get('unchanged'))}")
+        if self.get("fast_fail"):
+            lines.append(
+                f"Hızlı geçilen selector: {int(self.get('fast_fail'))} "
+                f"(~{self.get('fast_fail_saved_ms') / 1000:.1f} sn timeout kazancı)"
+            )
+        for mode, label in (("cold", "soğuk"), ("warm", "sıcak")):
+            if self.get(f"browser_start_ms_{mode}"):
+                lines.append(f"Tarayıcı başlangıcı ({label}): {self.get(f'browser_start_ms_{mode}'):.0f} ms")
+        if self.get("pool_start_ms"):
+            lines.append(f"Context/sayfa hazırlığı: {self.get('pool_start_ms'):.0f} ms")
+        if self.get("first_result_ms"):
+            lines.append(f"İlk sonuca kadar: {self.get('first_result_ms') / 1000:.1f} sn")
+        if self.get("page_recycles") or self.get("context_recycles") or self.get("memory_recycles"):
+            lines.append(
+                f"Yenileme: {int(self.get('page_recycles'))} sayfa | "
+                f"{int(self.get('context_recycles'))} context (gezinme sayısı) | "
+                f"{int(self.get('memory_recycles'))} context (bellek)"
+            )
+        if self.get("daemon_errors"):
+            lines.append(f"Daemon'da beklenmeyen hata (yeniden zamanlandı): {int(self.get('daemon_errors'))}")
+        if self.get("lease_lost"):
+            lines.append(f"Kirası başka düğüme geçtiği için atılan sonuç: {int(self.get('lease_lost'))}")
+        for reporter in self._reporters:
+            lines.extend(reporter())
+        return lines
+
+    def print_summary(self):
+        print("\n" + "=" * 50)
+        for line in self.summary_lines():
+            print(f"[ÖZET] {line}")
+        print("=" * 50)
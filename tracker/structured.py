@@ -0,0 +1,236 @@
+"""
+Price Tracker - Yapısal Veri Çıkarma
+====================================
+Birçok site fiyat ve stok bilgisini JSON-LD (schema.org Product) ya da
+gömülü uygulama durumu (window.__..._STATE__) script'lerinde taşır.
+Bunları okumak selector yürütmekten hem ucuz hem de tasarım
+değişikliklerine karşı daha dayanıklıdır; bu yüzden selector'lardan
+önce denenir, bulunamazsa mevcut scrape akışına düşülür.
+
+Site tanımındaki isteğe bağlı "structured" bölümü:
+    "structured": {
+        "jsonld": true,
+        "state_vars": ["__PRODUCT_DETAIL_APP_INITIAL_STATE__"],
+        "paths": {"title": ["product.name"], "price": ["product.price.sellingPrice.text"],
+                  "stock": ["product.inStock"]}
+    }
+"""
+
+import json
+import re
+from collections import defaultdict
+
+
+IN_STOCK = "Stokta Var"
+OUT_OF_STOCK = "Stok Yok/Tükendi"
+
+# schema.org availability değerlerinin son parçası -> stok metni
+AVAILABILITY = {
+    "instock": IN_STOCK,
+    "limitedavailability": IN_STOCK,
+    "onlineonly": IN_STOCK,
+    "preorder": "Ön Sipariş",
+    "backorder": "Ön Sipariş",
+    "outofstock": OUT_OF_STOCK,
+    "soldout": OUT_OF_STOCK,
+    "discontinued": OUT_OF_STOCK,
+}
+
+LD_JSON_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+
+# Sayfa içinde çalışır: JSON-LD metinlerini ve istenen durum
+# değişkenlerindeki yolların değerlerini döndürür. Durum nesneleri
+# megabaytlarca olabildiği için tamamı değil sadece yollar taşınır.
+STRUCTURED_JS = """
+({jsonld, stateVars, paths}) => {
+    const resolve = (obj, path) => {
+        for (const key of path.split('.')) {
+            if (obj === null || obj === undefined) return undefined;
+            obj = obj[key];
+        }
+        return obj;
+    };
+    const ld = jsonld
+        ? Array.from(document.querySelectorAll('script[type="application/ld+json"]')).map(s => s.textContent)
+        : [];
+    const state = {};
+    for (const name of stateVars) {
+        const root = window[name];
+        if (!root) continue;
+        for (const [field, candidates] of Object.entries(paths)) {
+            if (state[field] !== undefined) continue;
+            for (const path of candidates) {
+                const value = resolve(root, path);
+                if (value !== undefined && value !== null && value !== '') { state[field] = value; break; }
+            }
+        }
+    }
+    return {ld, state};
+}
+"""
+
+
+def _resolve(obj, path: str):
+    for key in path.split("."):
+        if isinstance(obj, list):
+            obj = obj[int(key)] if key.isdigit() and int(key) < len(obj) else None
+        elif isinstance(obj, dict):
+            obj = obj.get(key)
+        else:
+            return None
+    return obj
+
+
+def _walk(node):
+    """JSON ağacındaki tüm sözlükler (@graph ve iç içe listeler dahil)."""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+
+
+def _is_product(node: dict) -> bool:
+    kind = node.get("@type")
+    kinds = kind if isinstance(kind, list) else [kind]
+    return any(str(k).lower() in ("product", "productgroup") for k in kinds)
+
+
+def _stock_text(value) -> str:
+    if isinstance(value, bool):
+        return IN_STOCK if value else OUT_OF_STOCK
+    if value is None:
+        return None
+    text = str(value).rstrip("/").rsplit("/", 1)[-1]
+    return AVAILABILITY.get(text.lower(), text)
+
+
+def _price_text(value) -> str:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        # clean_price noktalı ondalığı doğru okur
+        return f"{value:.2f}"
+    return str(value).strip()
+
+
+def product_from_jsonld(texts: list) -> dict:
+    """JSON-LD bloklarındaki ilk Product'tan title/price/stock çıkarır."""
+    for text in texts:
+        try:
+            document = json.loads(text)
+        except (TypeError, ValueError):
+            continue
+        for node in _walk(document):
+            if not _is_product(node):
+                continue
+            offers = node.get("offers") or {}
+            if isinstance(offers, list):
+                offers = offers[0] if offers else {}
+            price = offers.get("price") or offers.get("lowPrice")
+            data = {
+                "title": node.get("name"),
+                "price": _price_text(price),
+                "stock": _stock_text(offers.get("availability")),
+            }
+            if data["title"] and data["price"]:
+                return data
+    return None
+
+
+def product_from_state(values: dict) -> dict:
+    """Gömülü durumdan çözülmüş yol değerlerini title/price/stock'a çevirir."""
+    if not values.get("title") or values.get("price") in (None, ""):
+        return None
+    return {
+        "title": str(values["title"]).strip(),
+        "price": _price_text(values["price"]),
+        "stock": _stock_text(values.get("stock")),
+    }
+
+
+def _state_from_html(html: str, name: str):
+    """`window.NAME = {...}` atamasındaki JSON nesnesini okur."""
+    match = re.search(r"(?:window\.)?" + re.escape(name) + r"\s*=\s*", html)
+    if not match:
+        return None
+    try:
+        value, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return None
+    return value
+
+
+class StructuredExtractor:
+    """Yapısal veriyi selector'lardan önce dener, domain başına isabet sayar."""
+
+    def __init__(self):
+        # domain -> {"http": [isabet, deneme], "browser": [isabet, deneme]}
+        self.domains = defaultdict(lambda: {"http": [0, 0], "browser": [0, 0]})
+
+    def _config(self, spec) -> dict:
+        config = getattr(spec, "structured", None)
+        return config if config is not None else {}
+
+    def _record(self, domain: str, tier: str, data: dict) -> dict:
+        counts = self.domains[domain][tier]
+        counts[1] += 1
+        if data:
+            counts[0] += 1
+            if not data["stock"]:
+                data["stock"] = "Belirsiz"
+        return data
+
+    def from_html(self, domain: str, html: str, spec) -> dict:
+        """Statik HTML'den (HTTP kademesi) yapısal veri; yoksa None."""
+        config = self._config(spec)
+        if config is False:
+            return None
+        data = None
+        for name in config.get("state_vars", []):
+            root = _state_from_html(html, name)
+            if root is None:
+                continue
+            values = {}
+            for field, candidates in config.get("paths", {}).items():
+                for path in candidates:
+                    value = _resolve(root, path)
+                    if value not in (None, ""):
+                        values[field] = value
+                        break
+            data = product_from_state(values)
+            if data:
+                break
+        if data is None and config.get("jsonld", True):
+            data = product_from_jsonld(LD_JSON_RE.findall(html))
+        return self._record(domain, "http", data)
+
+    async def from_page(self, page, domain: str, spec) -> dict:
+        """Açık sayfadan tek evaluate ile yapısal veri; yoksa None."""
+        config = self._config(spec)
+        if config is False:
+            return None
+        try:
+            found = await page.evaluate(STRUCTURED_JS, {
+                "jsonld": config.get("jsonld", True),
+                "stateVars": config.get("state_vars", []),
+                "paths": config.get("paths", {}),
+            })
+        except Exception:
+            found = {"ld": [], "state": {}}
+        data = product_from_state(found["state"]) or product_from_jsonld(found["ld"])
+        return self._record(domain, "browser", data)
+
+    def summary_lines(self) -> list:
+        lines = []
+        for domain, tiers in sorted(self.domains.items()):
+            http_hit, http_total = tiers["http"]
+            browser_hit, browser_total = tiers["browser"]
+            lines.append(
+                f"Yapısal veri {domain}: tarayıcısız {http_hit}/{http_total} | "
+                f"tarayıcıda {browser_hit}/{browser_total}"
+            )
+        return lines
@@ -0,0 +1,130 @@
+"""
+Price Tracker - Öğrenen Sayfa Hazır Beklemesi
+=============================================
+Sabit 2 sn bekleme yerine sitenin hazır işareti (fiyat alanı) ya da ağ
+sessizliği (networkidle) beklenir; hangisi önce gelirse. Üst sınır
+domain bazında gözlenen hazır olma sürelerinden öğrenilir (p95 x
+CAP_FACTOR) ve çalıştırmalar arasında JSON dosyasında saklanır.
+
+Zaman aşımına uğrayan bekleme, sınırın kendisi örnek olarak eklenir;
+yoksa yavaşlayan bir sitede p95 hep düşük kalır ve sınır hiç büyümez.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+
+DEFAULT_CAP_MS = 10000
+MIN_CAP_MS = 1500
+MAX_CAP_MS = 20000
+CAP_FACTOR = 1.5
+MIN_SAMPLES = 5
+MAX_SAMPLES = 200
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class ReadinessModel:
+    """Domain başına hazır olma süreleri (ms) ve bunlardan türeyen bekleme sınırı."""
+
+    def __init__(self, path: str = "bekleme_sureleri.json"):
+        self.path = path
+        self.samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+        self.timeouts = defaultdict(int)
+        # Bu süreçte eklenen örnekler; save() diskteki dosyayla birleştirir
+        self.fresh = defaultdict(list)
+        for domain, samples in self._read().items():
+            self.samples[domain].extend(samples)
+
+    def _read(self) -> dict:
+        if not Path(self.path).exists():
+            return {}
+        try:
+            data = json.loads(Path(self.path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            print(f"[WAIT] {self.path} okunamadı, varsayılan sınırlar kullanılacak")
+            return {}
+        return data.get("samples", {})
+
+    def _add(self, domain: str, sample: int):
+        self.samples[domain].append(sample)
+        self.fresh[domain].append(sample)
+
+    def save(self):
+        """
+        Yeni örnekleri diskteki güncel dosyaya ekleyerek yazar; aynı dosyayı
+        kullanan işçi süreçleri birbirinin örneklerini ezmez.
+        """
+        merged = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+        for domain, samples in self._read().items():
+            merged[domain].extend(samples)
+        for domain, samples in self.fresh.items():
+            merged[domain].extend(samples)
+        self.fresh.clear()
+        data = {"samples": {domain: list(samples) for domain, samples in merged.items()}}
+        # Birden çok süreç aynı dosyaya yazabilir; yarım dosya kalmasın
+        tmp = Path(f"{self.path}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def cap_ms(self, domain: str) -> int:
+        """Domain için bekleme üst sınırı; yeterli örnek yoksa varsayılan."""
+        samples = self.samples[domain]
+        if len(samples) < MIN_SAMPLES:
+            return DEFAULT_CAP_MS
+        return int(min(MAX_CAP_MS, max(MIN_CAP_MS, percentile(samples, 0.95) * CAP_FACTOR)))
+
+    async def wait(self, page, anchors: list, domain: str) -> str:
+        """
+        Hazır işaretini ya da ağ sessizliğini bekler; hangi sinyalin
+        geldiğini ("anchor", "networkidle") ya da "timeout" döndürür.
+        """
+        cap = self.cap_ms(domain)
+        started = time.monotonic()
+
+        async def signal(name, waiter):
+            try:
+                await waiter
+                return name
+            except Exception:
+                return None
+
+        tasks = [asyncio.ensure_future(signal("networkidle", page.wait_for_load_state("networkidle", timeout=cap)))]
+        if anchors:
+            tasks.append(asyncio.ensure_future(signal("anchor", page.wait_for_selector(", ".join(anchors), timeout=cap))))
+
+        fired = None
+        pending = set(tasks)
+        while pending and fired is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            fired = next((task.result() for task in done if task.result()), None)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if fired is None:
+            self.timeouts[domain] += 1
+            self._add(domain, cap)
+            return "timeout"
+        self._add(domain, round((time.monotonic() - started) * 1000))
+        return fired
+
+    def summary_lines(self) -> list:
+        lines = []
+        for domain, samples in sorted(self.samples.items()):
+            if not samples:
+                continue
+            lines.append(
+                f"Bekleme {domain}: p50 {percentile(samples, 0.5):.0f} ms | "
+                f"p95 {percentile(samples, 0.95):.0f} ms | sınır {self.cap_ms(domain)} ms | "
+                f"zaman aşımı {self.timeouts[domain]}"
+            )
+        return lines
@@ -0,0 +1,97 @@
+"""
+Price Tracker - İzleme Listesi Okuyucu
+======================================
+CSV, JSONL ya da xlsx (read-only mod) izleme listelerini satır satır
+okur; dosya belleğe tamamen yüklenmez. Zorunlu sütun "url"dir, "name"
+yoksa URL kullanılır; diğer sütunlar (ör. "interval", en ucuz site
+alarmı için "group") aynen taşınır.
+
+--shard i/N: URL'nin crc32 özeti N'e bölündüğünde kalanı i olan satırlar
+bu makineye düşer (0 <= i < N). Aynı liste her makinede aynı şekilde
+bölünür, çakışma ya da boşluk olmaz.
+"""
+
+import csv
+import json
+import zlib
+from pathlib import Path
+
+
+def _clean(row: dict) -> dict:
+    row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+    url = str(row.get("url") or "").strip()
+    if not url:
+        return None
+    row["url"] = url
+    row["name"] = str(row.get("name") or url).strip()
+    return row
+
+
+def _iter_csv(path: Path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def _iter_jsonl(path: Path):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"[WATCHLIST] {path.name}:{line_no} geçersiz JSON, atlandı")
+
+
+def _iter_xlsx(path: Path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if not headers:
+            return
+        for values in rows:
+            yield dict(zip(headers, values))
+    finally:
+        wb.close()
+
+
+READERS = {".csv": _iter_csv, ".jsonl": _iter_jsonl, ".xlsx": _iter_xlsx}
+
+
+def iter_watchlist(path: str):
+    """İzleme listesindeki ürünleri tek tek üretir."""
+    path = Path(path)
+    reader = READERS.get(path.suffix.lower())
+    if reader is None:
+        raise ValueError(f"Desteklenmeyen izleme listesi: {path.suffix} ({', '.join(READERS)})")
+    for raw in reader(path):
+        product = _clean(raw)
+        if product:
+            yield product
+
+
+def parse_shard(text: str) -> tuple:
+    """'i/N' metnini (i, N) ikilisine çevirir."""
+    try:
+        index, total = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard 'i/N' biçiminde olmalı: {text}")
+    if total < 1 or not 0 <= index < total:
+        raise ValueError(f"Shard aralık dışında: {text} (0 <= i < N)")
+    return index, total
+
+
+def in_shard(url: str, index: int, total: int) -> bool:
+    return zlib.crc32(url.encode("utf-8")) % total == index
+
+
+def shard(products, index: int, total: int):
+    """Sadece bu shard'a düşen ürünleri geçirir (lazy)."""
+    for product in products:
+        if in_shard(product["url"], index, total):
+            yield product
@@ -0,0 +1,254 @@
+"""
+Price Tracker - Çok Süreçli Tarayıcı İşçileri
+=============================================
+N işçi süreci her biri kendi Chromium'unu açar. Ana süreç ortak iş
+kaynağından (izleme listesi) her işçinin gelen kutusuna en fazla
+`slots` iş dağıtır; böylece hangi işin hangi işçide olduğu bilinir.
+Sonuçlar her işçinin kendi Pipe'ından ana sürece akar (depo ve Excel
+yazımı sadece ana süreçte yapılır). Ortak bir sonuç kuyruğu yerine
+işçi başına Pipe kullanılır: yazarken ölen bir işçi ortak kuyruğun
+kilidini tutup diğerlerini kilitleyebilirdi.
+
+- Çöken işçi yeniden başlatılır, elindeki işler kuyruğa geri döner.
+  restart_window saniye içinde max_restarts'tan fazla çökme olursa
+  çalıştırma durdurulur (bellek yenilemeleri sayılmaz).
+- İşçi + Chromium alt süreçlerinin RSS toplamı memory_limit_mb'yi
+  aşarsa işçi boşaltılır: yeni iş verilmez, dur işareti gönderilir,
+  elindeki işler bitip süreç çıkınca yerine yenisi açılır (psutil gerekir).
+- Bir iş MAX_JOB_ATTEMPTS kez işçi çökmesine denk gelirse on_lost ile
+  hatalı sonuç olarak kaydedilir. Bellek yenilemesi işlere deneme saymaz.
+
+Not: hız sınırı ve devre kesici her işçide ayrı tutulur.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import time
+from collections import deque
+from multiprocessing.connection import wait as wait_connections
+
+
+POLL_INTERVAL = 0.5
+HEALTH_CHECK_EVERY = 5.0
+MAX_JOB_ATTEMPTS = 2
+# Boşaltılan işçi bu süre (sn) içinde çıkmazsa zorla durdurulur
+DRAIN_TIMEOUT = 120
+
+
+class WorkerHandle:
+    def __init__(self, worker_id: int, generation: int, process, inbox, conn):
+        self.worker_id = worker_id
+        self.generation = generation
+        self.process = process
+        self.inbox = inbox
+        self.conn = conn
+        self.jobs = {}      # job_id -> (product, attempts)
+        self.closing = False
+        self.closing_since = None
+
+
+def _process_rss_mb(pid: int) -> float:
+    """Süreç ve tüm alt süreçlerinin (Chromium) toplam RSS'i (MB)."""
+    import psutil
+
+    proc = psutil.Process(pid)
+    total = proc.memory_info().rss
+    for child in proc.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1024 / 1024
+
+
+def _kill_tree(process):
+    try:
+        import psutil
+
+        for child in psutil.Process(process.pid).children(recursive=True):
+            child.kill()
+    except Exception:
+        pass
+    process.kill()
+    process.join(timeout=5)
+
+
+class ProcessPoolRunner:
+    """
+    target(worker_id, generation, inbox, results, *target_args) imzalı
+    işçi fonksiyonunu N süreçte çalıştırır. inbox'tan (job_id, product)
+    ya da dur işareti None okunur; results bir Pipe ucudur.
+
+    İşçi mesajı: results.send(("result", job_id, result, counters))
+    """
+
+    def __init__(self, target, workers: int = 2, slots: int = 4, memory_limit_mb: float = None,
+                 max_restarts: int = 10, restart_window: float = 600, target_args: tuple = ()):
+        self.ctx = multiprocessing.get_context("spawn")
+        self.target = target
+        self.worker_count = max(1, workers)
+        self.slots = max(1, slots)
+        self.memory_limit_mb = memory_limit_mb
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self._crash_times = deque()
+        self.target_args = target_args
+        self.workers = {}
+        self._generations = itertools.count()
+        self.restarts = 0
+        self.memory_kills = 0
+        self.crashes = 0
+
+        if memory_limit_mb:
+            try:
+                import psutil  # noqa: F401
+            except ImportError:
+                print("[WORKER] psutil kurulu değil, bellek sınırı devre dışı")
+                self.memory_limit_mb = None
+
+    def _spawn(self, worker_id: int) -> WorkerHandle:
+        generation = next(self._generations)
+        inbox = self.ctx.Queue()
+        reader, writer = self.ctx.Pipe(duplex=False)
+        process = self.ctx.Process(
+            target=self.target,
+            args=(worker_id, generation, inbox, writer, *self.target_args),
+            daemon=True,
+        )
+        process.start()
+        writer.close()
+        print(f"[WORKER] #{worker_id} başlatıldı (pid {process.pid})")
+        handle = WorkerHandle(worker_id, generation, process, inbox, reader)
+        self.workers[worker_id] = handle
+        return handle
+
+    def _replace(self, handle: WorkerHandle, backlog: deque, on_lost, crashed: bool = True):
+        """
+        İşçiyi durdurur, elindeki işleri geri kuyruğa koyar ve yenisini açar.
+        Sadece çökmeler işlere deneme ve yeniden başlatma sınırına sayılır.
+        """
+        _kill_tree(handle.process)
+        handle.conn.close()
+        for job_id, (product, attempts) in handle.jobs.items():
+            if not crashed:
+                backlog.append((job_id, product, attempts))
+            elif attempts + 1 >= MAX_JOB_ATTEMPTS:
+                on_lost(product)
+            else:
+                backlog.append((job_id, product, attempts + 1))
+        handle.jobs.clear()
+        if crashed:
+            now = time.monotonic()
+            self._crash_times.append(now)
+            while self._crash_times[0] < now - self.restart_window:
+                self._crash_times.popleft()
+            if len(self._crash_times) > self.max_restarts:
+                raise RuntimeError(f"İşçiler {self.restart_window:.0f} sn içinde "
+                                   f"{len(self._crash_times)} kez çöktü, durduruluyor")
+        self.restarts += 1
+        self._spawn(handle.worker_id)
+
+    def _drain(self, handle: WorkerHandle):
+        """Yeni iş vermeyi keser; işçi elindekileri bitirip dur işaretiyle çıkar."""
+        handle.closing = True
+        handle.closing_since = time.monotonic()
+        handle.inbox.put(None)
+
+    def _check_health(self, backlog: deque, on_lost):
+        for handle in list(self.workers.values()):
+            if not handle.process.is_alive():
+                if handle.closing:
+                    print(f"[WORKER] #{handle.worker_id} boşaltıldı, yenisi açılıyor")
+                    self._replace(handle, backlog, on_lost, crashed=False)
+                    continue
+                print(f"[WORKER] #{handle.worker_id} çöktü (çıkış kodu {handle.process.exitcode}), "
+                      f"{len(handle.jobs)} iş geri kuyruğa")
+                self.crashes += 1
+                self._replace(handle, backlog, on_lost)
+                continue
+            if handle.closing:
+                if time.monotonic() - handle.closing_since > DRAIN_TIMEOUT:
+                    print(f"[WORKER] #{handle.worker_id} {DRAIN_TIMEOUT} sn'de boşalmadı, durduruluyor")
+                    self._replace(handle, backlog, on_lost, crashed=False)
+                continue
+            if not self.memory_limit_mb:
+                continue
+            try:
+                rss = _process_rss_mb(handle.process.pid)
+            except Exception:
+                continue
+            if rss > self.memory_limit_mb:
+                print(f"[WORKER] #{handle.worker_id} bellek sınırını aştı "
+                      f"({rss:.0f} MB > {self.memory_limit_mb:.0f} MB), boşaltılıyor")
+                self.memory_kills += 1
+                self._drain(handle)
+
+    async def run(self, products, on_result, on_lost):
+        """
+        products'ı işçilere dağıtır; her sonuç için on_result(result, counters),
+        kaybedilen işler için on_lost(product) çağrılır.
+        """
+        source = iter(products)
+        backlog = deque()
+        job_ids = itertools.count()
+        exhausted = False
+        last_check = time.monotonic()
+
+        for worker_id in range(self.worker_count):
+            self._spawn(worker_id)
+
+        try:
+            while True:
+                # Boş yeri olan işçilere iş dağıt
+                for handle in self.workers.values():
+                    while not handle.closing and len(handle.jobs) < self.slots:
+                        if backlog:
+                            job_id, product, attempts = backlog.popleft()
+                        elif not exhausted:
+                            product = next(source, None)
+                            if product is None:
+                                exhausted = True
+                                break
+                            job_id, attempts = next(job_ids), 0
+                        else:
+                            break
+                        handle.jobs[job_id] = (product, attempts)
+                        handle.inbox.put((job_id, product))
+
+                if exhausted and not backlog and not any(h.jobs for h in self.workers.values()):
+                    break
+
+                readers = {handle.conn: handle for handle in self.workers.values()}
+                ready = await asyncio.to_thread(wait_connections, list(readers), POLL_INTERVAL)
+                broken = False
+                for conn in ready:
+                    handle = readers[conn]
+                    try:
+                        message = conn.recv()
+                    except (EOFError, OSError):
+                        # İşçi öldü; bağlantı bir daha okunmasın, hemen yenile
+                        broken = True
+                        handle.process.join(timeout=1)
+                        continue
+                    _, job_id, result, counters = message
+                    if job_id in handle.jobs:
+                        del handle.jobs[job_id]
+                        on_result(result, counters)
+
+                if broken or time.monotonic() - last_check >= HEALTH_CHECK_EVERY:
+                    self._check_health(backlog, on_lost)
+                    last_check = time.monotonic()
+        finally:
+            for handle in self.workers.values():
+                handle.inbox.put(None)
+            for handle in self.workers.values():
+                handle.process.join(timeout=30)
+                if handle.process.is_alive():
+                    _kill_tree(handle.process)
+
+    def summary_lines(self) -> list:
+        return [
+            f"İşçi: {self.worker_count} süreç | yeniden başlatma {self.restarts} "
+            f"(çökme {self.crashes}, bellek {self.memory_kills})"
+        ]
@@ -0,0 +1,292 @@
+"""
+Price Tracker - Kiralamalı Dağıtık İş Kuyruğu
+=============================================
+Birden çok makine aynı izleme listesini paylaşır. Her düğüm işleri
+süreli bir kira (lease) ile alır, çalışırken kirayı heartbeat ile
+uzatır. Süresi dolan kiralar başka bir düğüme yeniden verilir.
+Sonuç, işin kira belirteci hâlâ geçerliyse işle aynı transaction'da
+yazılır; bu yüzden her iş için tam olarak bir sonuç kaydedilir.
+
+Kuyruktaki sonuçlar asıl kayıttır: düğümler kendi fiyat geçmişlerine
+(iş, kira) anahtarıyla yazar, `--collect` ise tüm düğümlerin sonuçlarını
+aynı anahtarla tek geçmişe toplar (tekrar çalıştırmak güvenlidir).
+Biten ya da başarısız işler yeniden kuyruğa eklenince tekrar bekler
+duruma döner; böylece aynı kuyruk dosyası her gün kullanılabilir.
+
+WorkQueue arayüzü başka arka uçlar (Redis, Postgres...) için
+genişletilebilir; open_queue() şu an SQLite dosyasını destekler.
+SQLite arka ucu aynı makinedeki (ya da yerel disk paylaşan) süreçler
+içindir; ağ dosya sistemlerinde SQLite kilitlemesine güvenilmemelidir.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+MAX_ATTEMPTS = 5
+
+
+class Job:
+    """Kiralanmış bir iş."""
+
+    def __init__(self, job_id: int, product: dict, token: str, attempts: int):
+        self.id = job_id
+        self.product = product
+        self.token = token
+        self.attempts = attempts
+
+    @property
+    def key(self) -> str:
+        """Bu kiranın sonucunu geçmişte tekil yapan anahtar."""
+        return result_key(self.id, self.token)
+
+
+def result_key(job_id: int, token: str) -> str:
+    return f"queue:{job_id}:{token}"
+
+
+class WorkQueue(ABC):
+    """Dağıtık iş kuyruğu arayüzü."""
+
+    @abstractmethod
+    def enqueue(self, products) -> int:
+        """
+        Ürünleri ekler; bekleyen/kirada aynı URL tekrar eklenmez, bitmiş ya
+        da başarısız olan yeniden bekler duruma alınır. Eklenen sayıyı döndürür.
+        """
+
+    @abstractmethod
+    def lease(self, node_id: str, count: int, lease_seconds: float) -> list:
+        """En fazla `count` işi bu düğüme kiralar."""
+
+    @abstractmethod
+    def heartbeat(self, jobs: list, lease_seconds: float) -> list:
+        """Kiraları uzatır; kaybedilmiş (başkasına geçmiş) işleri döndürür."""
+
+    @abstractmethod
+    def complete(self, job: Job, node_id: str, result: dict) -> bool:
+        """Kira geçerliyse sonucu kaydeder ve True döndürür."""
+
+    @abstractmethod
+    def release(self, job: Job):
+        """Bitirilmeyen işi hemen kuyruğa geri bırakır."""
+
+    @abstractmethod
+    def counts(self) -> dict:
+        """Durum -> iş sayısı."""
+
+    @abstractmethod
+    def iter_results(self, node_id: str = None):
+        """(anahtar, sonuç) çiftleri, tamamlanma sırasıyla."""
+
+    def remaining(self) -> int:
+        counts = self.counts()
+        return counts.get("pending", 0) + counts.get("leased", 0)
+
+    def close(self):
+        pass
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    url           TEXT NOT NULL UNIQUE,
+    product       TEXT NOT NULL,
+    state         TEXT NOT NULL DEFAULT 'pending',
+    lease_owner   TEXT,
+    lease_token   TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, lease_expires);
+"""
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id       INTEGER NOT NULL REFERENCES jobs (id),
+    lease_token  TEXT NOT NULL,
+    node_id      TEXT NOT NULL,
+    result       TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    UNIQUE (job_id, lease_token)
+)
+"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Tek SQLite dosyası üzerinde kiralamalı kuyruk.
+
+    Kilit beklemesi (busy timeout) 30 sn'ye kadar sürebilir; async
+    düğümler metotları asyncio.to_thread ile çağırır. Bağlantı thread'ler
+    arasında paylaşıldığı için her işlem kendi kilidini alır.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        # isolation_level=None: transaction'ları BEGIN IMMEDIATE ile kendimiz yönetiyoruz
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.execute(RESULTS_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _migrate(self):
+        """Eski (iş başına tek sonuçlu) results tablosunu kira anahtarlı yapıya taşır."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        if not columns or "lease_token" in columns:
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.execute("ALTER TABLE results RENAME TO results_old")
+        self.conn.execute(RESULTS_SCHEMA)
+        self.conn.execute(
+            "INSERT INTO results (job_id, lease_token, node_id, result, completed_at) "
+            "SELECT job_id, 'eski', node_id, result, completed_at FROM results_old")
+        self.conn.execute("DROP TABLE results_old")
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, products, batch_size: int = 1000) -> int:
+        before = self.conn.total_changes
+        batch = []
+        for product in products:
+            batch.append((product["url"], json.dumps(product, ensure_ascii=False)))
+            if len(batch) >= batch_size:
+                self._insert(batch)
+                batch = []
+        if batch:
+            self._insert(batch)
+        return self.conn.total_changes - before
+
+    def _insert(self, batch: list):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            # Bitmiş/başarısız iş yeni bir tur için bekler duruma döner
+            self.conn.executemany(
+                "INSERT INTO jobs (url, product) VALUES (?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET product = excluded.product, state = 'pending', "
+                "lease_owner = NULL, lease_token = NULL, lease_expires = NULL, attempts = 0 "
+                "WHERE state IN ('done', 'failed')",
+                batch,
+            )
+            self.conn.execute("COMMIT")
+
+    def lease(self, node_id: str, count: int, lease_seconds: float) -> list:
+        if count <= 0:
+            return []
+        with self._lock:
+            return self._lease(node_id, count, lease_seconds)
+
+    def _lease(self, node_id: str, count: int, lease_seconds: float) -> list:
+        now = time.time()
+        token = uuid.uuid4().hex
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Defalarca düşen işler sonsuza dek dolaşmasın
+            self.conn.execute(
+                "UPDATE jobs SET state = 'failed' "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, MAX_ATTEMPTS),
+            )
+            rows = self.conn.execute(
+                "SELECT id, product, attempts FROM jobs "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, count),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_token = ?, "
+                "lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                [(node_id, token, now + lease_seconds, row[0]) for row in rows],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [Job(row[0], json.loads(row[1]), token, row[2] + 1) for row in rows]
+
+    def heartbeat(self, jobs: list, lease_seconds: float) -> list:
+        expires = time.time() + lease_seconds
+        lost = []
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for job in jobs:
+                cursor = self.conn.execute(
+                    "UPDATE jobs SET lease_expires = ? "
+                    "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                    (expires, job.id, job.token),
+                )
+                if cursor.rowcount == 0:
+                    lost.append(job)
+            self.conn.execute("COMMIT")
+        return lost
+
+    def complete(self, job: Job, node_id: str, result: dict) -> bool:
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self.conn.execute(
+                    "UPDATE jobs SET state = 'done', lease_expires = NULL "
+                    "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                    (job.id, job.token),
+                )
+                accepted = cursor.rowcount == 1
+                if accepted:
+                    self.conn.execute(
+                        "INSERT INTO results (job_id, lease_token, node_id, result, completed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (job.id, job.token, node_id, json.dumps(result, ensure_ascii=False), time.time()),
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return accepted
+
+    def release(self, job: Job):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE jobs SET state = 'pending', lease_owner = NULL, lease_token = NULL, "
+                "lease_expires = NULL WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (job.id, job.token),
+            )
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def remaining(self) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased')"
+            ).fetchone()[0]
+
+    def iter_results(self, node_id: str = None):
+        """(anahtar, sonuç) çiftleri, tamamlanma sırasıyla; node_id verilirse sadece o düğümün."""
+        query, params = "SELECT job_id, lease_token, result FROM results", ()
+        if node_id:
+            query, params = query + " WHERE node_id = ?", (node_id,)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY completed_at, id", params).fetchall()
+        for job_id, token, result in rows:
+            yield result_key(job_id, token), json.loads(result)
+
+    def close(self):
+        self.conn.close()
+
+
+def open_queue(location: str) -> WorkQueue:
+    """'sqlite:///yol.db' ya da düz dosya yolu."""
+    if location.startswith("sqlite:///"):
+        return SQLiteWorkQueue(location[len("sqlite:///"):])
+    if "://" in location:
+        raise ValueError(f"Desteklenmeyen kuyruk arka ucu: {location.split('://')[0]}")
+    return SQLiteWorkQueue(location)